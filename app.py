@@ -1,12 +1,31 @@
 # app.py
 import os
+import sys
+import json
 import logging
 import sqlite3
 import time
 import re
-from datetime import datetime
+import hashlib
+import threading
+import functools
+import uuid
+import socket
+import argparse
+import csv
+import io
+import zlib
+import gzip
+import glob
+import statistics
+import multiprocessing
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, render_template_string, jsonify, request, url_for, g
 
 import feedparser
 import requests
@@ -19,6 +38,16 @@ except Exception:
 from apscheduler.schedulers.background import BackgroundScheduler
 import atexit
 
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
 # ----- zoneinfo / pytz fallback (NO backports.zoneinfo) -----
 try:
     # Python 3.9+
@@ -38,6 +67,47 @@ DEBUG = os.getenv("FLASK_DEBUG", "False").lower() in ("1", "true", "yes")
 DB_PATH = os.getenv("DB_PATH", "financial_news.db")
 MARKETAUX_API_TOKEN = os.getenv("MARKETAUX_API_TOKEN", "DEMO")
 FLASK_SECRET_KEY = os.getenv("FLASK_SECRET_KEY", "please-set-a-secret-key")
+FETCH_CONCURRENT = os.getenv("FETCH_CONCURRENT", "True").lower() in ("1", "true", "yes")
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "8"))
+SOURCE_TIMEOUT = float(os.getenv("SOURCE_TIMEOUT", "20"))
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE", "60"))
+SOURCE_DEADLINE = float(os.getenv("SOURCE_DEADLINE", "45"))
+FETCH_RETRIES = int(os.getenv("FETCH_RETRIES", "3"))
+FETCH_JOB_HISTORY = int(os.getenv("FETCH_JOB_HISTORY", "50"))
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "lease")
+LEASE_TTL = float(os.getenv("LEASE_TTL", "60"))
+FETCH_SCHEDULE = os.getenv("FETCH_SCHEDULE", "adaptive")
+POLL_TICK_SECONDS = int(os.getenv("POLL_TICK_SECONDS", "60"))
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "300"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", str(6 * 3600)))
+POLL_DEFAULT_INTERVAL = float(os.getenv("POLL_DEFAULT_INTERVAL", "1800"))
+POLL_TARGET_ARTICLES = float(os.getenv("POLL_TARGET_ARTICLES", "5"))
+POLL_EWMA_ALPHA = float(os.getenv("POLL_EWMA_ALPHA", "0.3"))
+POLL_OFF_HOURS_FACTOR = float(os.getenv("POLL_OFF_HOURS_FACTOR", "2"))
+POLL_MAX_BACKOFF = float(os.getenv("POLL_MAX_BACKOFF", str(6 * 3600)))
+MARKET_HOURS = os.getenv("MARKET_HOURS", "09:15-15:30")
+SENTIMENT_MODE = os.getenv("SENTIMENT_MODE", "compat")
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_STATEMENT_CACHE = int(os.getenv("SQLITE_STATEMENT_CACHE", "256"))
+RESPONSE_CACHE_ENTRIES = int(os.getenv("RESPONSE_CACHE_ENTRIES", "256"))
+RESPONSE_CACHE_BYTES = int(os.getenv("RESPONSE_CACHE_BYTES", str(32 * 1024 * 1024)))
+DASHBOARD_STATS_HOURS = int(os.getenv("DASHBOARD_STATS_HOURS", "24"))
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "1000"))
+CLUSTER_MIN_SIMILARITY = float(os.getenv("CLUSTER_MIN_SIMILARITY", "0.5"))
+CLUSTER_WINDOW_HOURS = int(os.getenv("CLUSTER_WINDOW_HOURS", "48"))
+DASHBOARD_DEDUPE = os.getenv("DASHBOARD_DEDUPE", "True").lower() in ("1", "true", "yes")
+SYMBOLS_PATH = os.getenv("SYMBOLS_PATH", "")
+TIMESERIES_MAX_POINTS = int(os.getenv("TIMESERIES_MAX_POINTS", "2000"))
+INGEST_PROFILE_DIR = os.getenv("INGEST_PROFILE_DIR", "")
+INGEST_PROFILE_INTERVAL = float(os.getenv("INGEST_PROFILE_INTERVAL", "0.005"))
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "0"))
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+ARCHIVE_BATCH_ROWS = int(os.getenv("ARCHIVE_BATCH_ROWS", "5000"))
+STREAM_POLL_SECONDS = float(os.getenv("STREAM_POLL_SECONDS", "5"))
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "25"))
+STREAM_MAX_SECONDS = float(os.getenv("STREAM_MAX_SECONDS", "1800"))
+STREAM_MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", "4"))
 # --------------------------
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -71,11 +141,176 @@ NEWS_SOURCES = {
             "language": "en",
         },
         "region": "Mixed",
+        # Free MarketAux plans allow 100 requests a day; leave headroom for manual fetches
+        "daily_budget": int(os.getenv("MARKETAUX_DAILY_BUDGET", "90")),
     },
 }
 
+# ----- metrics -----
+# Counters and histograms rendered in the Prometheus text format at /metrics. Each
+# process records in memory and adds its deltas to the shared metric_values table
+# every METRICS_FLUSH_SECONDS (and before serving a scrape), so any gunicorn worker
+# reports the totals of every web worker and the ingest process.
+METRIC_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "10"))
+
+class Metrics:
+    def __init__(self, buckets=METRIC_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    hist[i] += 1
+            hist[-2] += seconds
+            hist[-1] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _fields(self):
+        return [repr(bound) for bound in self.buckets] + ["sum", "count"]
+
+    def flush(self):
+        # Moves everything recorded since the last flush into metric_values
+        with self._lock:
+            counters, histograms = self._counters, self._histograms
+            self._counters, self._histograms = {}, {}
+        rows = [(name, json.dumps(labels), "", value) for (name, labels), value in counters.items()]
+        fields = self._fields()
+        for (name, labels), hist in histograms.items():
+            rows.extend((name, json.dumps(labels), field, value) for field, value in zip(fields, hist))
+        if not rows:
+            return
+        try:
+            with write_transaction() as cur:
+                cur.executemany("INSERT INTO metric_values (name, labels, field, value) VALUES (?, ?, ?, ?) "
+                                "ON CONFLICT (name, labels, field) DO UPDATE SET value = value + excluded.value",
+                                rows)
+        except sqlite3.Error:
+            logging.exception("Failed to flush metrics; keeping them for the next flush")
+            with self._lock:
+                for key, value in counters.items():
+                    self._counters[key] = self._counters.get(key, 0) + value
+                for key, hist in histograms.items():
+                    pending = self._histograms.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+                    self._histograms[key] = [a + b for a, b in zip(pending, hist)]
+
+    def collect(self):
+        # Totals across every process, including what this one has not flushed yet
+        self.flush()
+        counters, histograms, index = {}, {}, {field: i for i, field in enumerate(self._fields())}
+        for name, labels, field, value in get_read_connection().execute(
+                "SELECT name, labels, field, value FROM metric_values"):
+            key = (name, tuple(tuple(pair) for pair in json.loads(labels)))
+            if not field:
+                counters[key] = int(value) if float(value).is_integer() else value
+            elif field in index:
+                hist = histograms.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+                hist[index[field]] = value
+        return counters, histograms
+
+    def render(self):
+        def fmt_labels(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{%s}" % ",".join('%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                                     for k, v in pairs)
+
+        counters, histograms = self.collect()
+        counters, histograms = sorted(counters.items()), sorted(histograms.items())
+        lines, typed = [], set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append("# TYPE %s counter" % name)
+                typed.add(name)
+            lines.append("%s%s %s" % (name, fmt_labels(labels), value))
+        for (name, labels), hist in histograms:
+            if name not in typed:
+                lines.append("# TYPE %s histogram" % name)
+                typed.add(name)
+            for bound, count in zip(self.buckets, hist):
+                lines.append("%s_bucket%s %d" % (name, fmt_labels(labels, [("le", bound)]), count))
+            lines.append("%s_bucket%s %d" % (name, fmt_labels(labels, [("le", "+Inf")]), hist[-1]))
+            lines.append("%s_sum%s %s" % (name, fmt_labels(labels), round(hist[-2], 6)))
+            lines.append("%s_count%s %d" % (name, fmt_labels(labels), hist[-1]))
+        return "\n".join(lines) + "\n"
+
+METRICS = Metrics()
+
+class SamplingProfiler:
+    # Samples the stacks of the ingest threads every `interval` seconds and writes them
+    # as collapsed stacks (one "frame;frame;frame count" line each), the input format
+    # of flamegraph.pl and speedscope.
+    def __init__(self, interval=0.005, thread_prefix="fetch"):
+        self.interval = interval
+        self.thread_prefix = thread_prefix
+        self.samples = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._owner = None
+
+    def start(self):
+        self._owner = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="ingest-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            watched = {t.ident for t in threading.enumerate() if t.name.startswith(self.thread_prefix)}
+            watched.add(self._owner)
+            for ident, frame in sys._current_frames().items():
+                if ident not in watched:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append("%s (%s:%d)" % (code.co_name, os.path.basename(code.co_filename), frame.f_lineno))
+                    frame = frame.f_back
+                key = ";".join(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+
+    def write(self, path):
+        with open(path, "w") as fh:
+            for stack, count in sorted(self.samples.items(), key=lambda item: -item[1]):
+                fh.write("%s %d\n" % (stack, count))
+
 # ----- requests session with retry (compatible) -----
-def make_requests_session(retries=3, backoff_factor=0.3, status_forcelist=(500, 502, 504)):
+def make_requests_session(retries=3, backoff_factor=0.3, status_forcelist=(500, 502, 504), pool_maxsize=10):
     session = requests.Session()
     retry_kwargs = dict(total=retries, read=retries, connect=retries, backoff_factor=backoff_factor,
                         status_forcelist=status_forcelist)
@@ -83,53 +318,448 @@ def make_requests_session(retries=3, backoff_factor=0.3, status_forcelist=(500,
         retry = Retry(**retry_kwargs, allowed_methods=frozenset(["GET", "POST"]))
     except TypeError:
         retry = Retry(**retry_kwargs, method_whitelist=frozenset(["GET", "POST"]))
-    adapter = HTTPAdapter(max_retries=retry)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     session.headers.update({"User-Agent": "FinancialNewsBot/1.0 (+https://example.com)"})
     return session
 
+# One keep-alive session shared by every fetch in the process
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+def get_http_session():
+    global _HTTP_SESSION
+    with _HTTP_SESSION_LOCK:
+        if _HTTP_SESSION is None:
+            # conditional_get() retries itself so attempts stay inside each source's deadline
+            _HTTP_SESSION = make_requests_session(retries=0, status_forcelist=(),
+                                                  pool_maxsize=max(FETCH_MAX_WORKERS, len(NEWS_SOURCES)))
+        return _HTTP_SESSION
+
+# ----- per-source HTTP validators (ETag / Last-Modified / body hash) -----
+def load_feed_validators(source_name):
+    try:
+        row = get_read_connection().execute(
+            "SELECT etag, last_modified, content_hash FROM feed_cache WHERE source = ?", (source_name,)).fetchone()
+    except sqlite3.Error:
+        logging.exception("Could not load cached validators for %s", source_name)
+        return {}
+    if not row:
+        return {}
+    return {"etag": row[0], "last_modified": row[1], "content_hash": row[2]}
+
+def store_feed_validators(timings):
+    rows = [(name, v.get("etag"), v.get("last_modified"), v.get("content_hash"), datetime.utcnow().isoformat())
+            for name, v in ((n, st.get("validators")) for n, st in timings.items()) if v]
+    if not rows:
+        return
+    with write_transaction() as cur:
+        cur.executemany('''
+            INSERT INTO feed_cache (source, etag, last_modified, content_hash, checked_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(source) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified,
+                content_hash = excluded.content_hash, checked_at = excluded.checked_at
+        ''', rows)
+
+def parse_retry_after(value):
+    # Retry-After is either delta-seconds or an HTTP date; returns seconds or None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+RETRY_STATUSES = (500, 502, 504)
+
+class SourceDeadlineExceeded(Exception):
+    pass
+
+def _read_body(resp, deadline):
+    # Reads in chunks so a slow-dripping origin cannot outlive the source's deadline
+    chunks = []
+    for chunk in resp.iter_content(65536):
+        chunks.append(chunk)
+        if deadline is not None and time.monotonic() > deadline:
+            resp.close()
+            raise SourceDeadlineExceeded()
+    return b"".join(chunks)
+
+def _get_with_deadline(session, url, stats, timeout=SOURCE_TIMEOUT, **kwargs):
+    # Up to FETCH_RETRIES retries on connection errors and 5xx, with exponential
+    # backoff, all inside stats["deadline"] (a time.monotonic() value, optional).
+    # Every HTTP request made is counted in stats["attempts"].
+    deadline = stats.get("deadline")
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic() if deadline is not None else timeout
+        if remaining <= 0:
+            raise SourceDeadlineExceeded()
+        stats["attempts"] = stats.get("attempts", 0) + 1
+        try:
+            resp = session.get(url, timeout=min(timeout, remaining), stream=True, **kwargs)
+            body = _read_body(resp, deadline)
+        except requests.RequestException:
+            if attempt >= FETCH_RETRIES:
+                raise
+        else:
+            if resp.status_code not in RETRY_STATUSES or attempt >= FETCH_RETRIES:
+                return resp, body
+        attempt += 1
+        pause = 0.3 * 2 ** (attempt - 1)
+        if deadline is not None:
+            pause = min(pause, max(0.0, deadline - time.monotonic()))
+        time.sleep(pause)
+
+def conditional_get(session, source_name, url, stats, **kwargs):
+    # Returns the response body, or None when the source reports/serves nothing new.
+    # New validators are left in stats["validators"] and only persisted once the
+    # articles built from this body have been saved.
+    cached = load_feed_validators(source_name)
+    headers = {}
+    if cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    try:
+        with METRICS.timer("newsapp_fetch_stage_seconds", source=source_name, stage="network"):
+            resp, body = _get_with_deadline(session, url, stats, headers=headers, **kwargs)
+    except SourceDeadlineExceeded:
+        stats["error"] = "deadline exceeded"
+        METRICS.inc("newsapp_fetch_deadline_exceeded_total", source=source_name)
+        logging.error("Fetch for %s exceeded its deadline", source_name)
+        return None
+    stats["status"] = resp.status_code
+    stats["bytes"] = len(body)
+    METRICS.inc("newsapp_fetch_bytes_total", len(body), source=source_name)
+    if resp.status_code == 304:
+        stats["not_modified"] = True
+        return None
+    if resp.status_code != 200:
+        stats["error"] = "HTTP %s" % resp.status_code
+        if resp.status_code in (429, 503):
+            stats["retry_after"] = parse_retry_after(resp.headers.get("Retry-After"))
+            METRICS.inc("newsapp_fetch_rate_limited_total", source=source_name)
+        logging.error("Request failed for %s: %s %s", source_name, resp.status_code,
+                      body[:200].decode("utf-8", "replace"))
+        return None
+    content_hash = hashlib.sha256(body).hexdigest()
+    stats["validators"] = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified"),
+                           "content_hash": content_hash}
+    if content_hash == cached.get("content_hash"):
+        stats["not_modified"] = True
+        return None
+    return body
+
 # ----- sentiment analysis -----
+POSITIVE_WORDS = ("gain", "rise", "up", "positive", "growth", "profit", "bullish", "buy", "strong", "good",
+                  "surge", "rally", "boom", "increase", "advance", "recovery", "outperform", "beat",
+                  "upgraded", "optimistic", "expansion", "milestone", "breakthrough", "success")
+NEGATIVE_WORDS = ("fall", "drop", "down", "negative", "loss", "bearish", "sell", "weak", "decline", "bad",
+                  "crash", "plunge", "slump", "recession", "crisis", "concern", "worry", "risk",
+                  "downgrade", "disappointing", "miss", "struggle", "challenge", "volatility")
+HIGH_IMPACT_WORDS = ("rbi", "federal", "interest rate", "policy", "gdp", "inflation", "election",
+                     "war", "oil", "gold", "dollar", "rupee", "sensex", "nifty", "bankruptcy")
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+class SentimentEngine:
+    # The lexicon is compiled once into a single matcher. Every lexicon entry owns one
+    # bit, so a text is reduced to one integer mask and scored with popcounts.
+    # mode="compat" keeps the original substring semantics ("up" also hits "update");
+    # mode="word" only counts whole-word matches.
+    def __init__(self, positive=POSITIVE_WORDS, negative=NEGATIVE_WORDS, high_impact=HIGH_IMPACT_WORDS,
+                 mode="compat"):
+        if mode not in ("compat", "word"):
+            raise ValueError("Unknown sentiment mode: %s" % mode)
+        self.mode = mode
+        entries = list(positive) + list(negative) + list(high_impact)
+        self._pos_mask = (1 << len(positive)) - 1
+        self._neg_mask = ((1 << len(negative)) - 1) << len(positive)
+        self._impact_mask = ((1 << len(high_impact)) - 1) << (len(positive) + len(negative))
+        self._word_masks = {}
+        for bit, word in enumerate(entries):
+            self._word_masks[word] = self._word_masks.get(word, 0) | (1 << bit)
+        self._automaton = None
+        self._word_re = None
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for word, mask in self._word_masks.items():
+                self._automaton.add_word(word, (len(word), mask))
+            self._automaton.make_automaton()
+        elif mode == "word":
+            alternation = "|".join(re.escape(w) for w in sorted(self._word_masks, key=len, reverse=True))
+            self._word_re = re.compile(r"\b(?:%s)\b" % alternation)
+        self._word_items = tuple(self._word_masks.items())
+
+    def match_mask(self, text_lower):
+        mask = 0
+        if self._automaton is not None:
+            if self.mode == "compat":
+                for _, (_, word_mask) in self._automaton.iter(text_lower):
+                    mask |= word_mask
+            else:
+                last = len(text_lower) - 1
+                for end, (length, word_mask) in self._automaton.iter(text_lower):
+                    start = end - length + 1
+                    if (start == 0 or not _is_word_char(text_lower[start - 1])) and \
+                            (end == last or not _is_word_char(text_lower[end + 1])):
+                        mask |= word_mask
+        elif self._word_re is not None:
+            for word in set(self._word_re.findall(text_lower)):
+                mask |= self._word_masks[word]
+        else:
+            for word, word_mask in self._word_items:
+                if word in text_lower:
+                    mask |= word_mask
+        return mask
+
+    def score_mask(self, mask):
+        pos_count = (mask & self._pos_mask).bit_count()
+        neg_count = (mask & self._neg_mask).bit_count()
+        impact_multiplier = 1.5 if mask & self._impact_mask else 1.0
+        if pos_count > neg_count:
+            sentiment = "Positive"
+            score = min(0.9, (pos_count - neg_count) * 0.3 * impact_multiplier)
+        elif neg_count > pos_count:
+            sentiment = "Negative"
+            score = -min(0.9, (neg_count - pos_count) * 0.3 * impact_multiplier)
+        else:
+            sentiment = "Neutral"
+            score = 0.0
+        total = pos_count + neg_count
+        confidence = min(95, max(60, total * 15 + 50))
+        return sentiment, score, int(confidence)
+
+    def analyze(self, text):
+        if not text:
+            return "Neutral", 0.0, 50
+        return self.score_mask(self.match_mask(text.lower()))
+
+    def analyze_batch(self, texts):
+        sentiments, scores, confidences = [], [], []
+        for text in texts:
+            sentiment, score, confidence = self.analyze(text)
+            sentiments.append(sentiment)
+            scores.append(score)
+            confidences.append(confidence)
+        return sentiments, scores, confidences
+
+SENTIMENT_ENGINE = SentimentEngine(mode=SENTIMENT_MODE)
+
 def analyze_sentiment(text):
-    if not text:
-        return "Neutral", 0.0, 50
-    positive_words = ["gain", "rise", "up", "positive", "growth", "profit", "bullish", "buy", "strong", "good",
-                      "surge", "rally", "boom", "increase", "advance", "recovery", "outperform", "beat",
-                      "upgraded", "optimistic", "expansion", "milestone", "breakthrough", "success"]
-    negative_words = ["fall", "drop", "down", "negative", "loss", "bearish", "sell", "weak", "decline", "bad",
-                      "crash", "plunge", "slump", "recession", "crisis", "concern", "worry", "risk",
-                      "downgrade", "disappointing", "miss", "struggle", "challenge", "volatility"]
-    high_impact_words = ["rbi", "federal", "interest rate", "policy", "gdp", "inflation", "election",
-                         "war", "oil", "gold", "dollar", "rupee", "sensex", "nifty", "bankruptcy"]
-    text_lower = text.lower()
-    pos_count = sum(1 for w in positive_words if w in text_lower)
-    neg_count = sum(1 for w in negative_words if w in text_lower)
-    impact_multiplier = 1.0
-    for w in high_impact_words:
-        if w in text_lower:
-            impact_multiplier = 1.5
-            break
-    if pos_count > neg_count:
-        sentiment = "Positive"
-        score = min(0.9, (pos_count - neg_count) * 0.3 * impact_multiplier)
-    elif neg_count > pos_count:
-        sentiment = "Negative"
-        score = -min(0.9, (neg_count - pos_count) * 0.3 * impact_multiplier)
-    else:
-        sentiment = "Neutral"
-        score = 0.0
-    total = pos_count + neg_count
-    confidence = min(95, max(60, total * 15 + 50))
-    return sentiment, score, int(confidence)
+    return SENTIMENT_ENGINE.analyze(text)
+
+def analyze_batch(texts):
+    return SENTIMENT_ENGINE.analyze_batch(texts)
+
+# ----- article scoring -----
+# Everything stored per article that is derived from its text. Bump SCORING_VERSION
+# whenever the lexicon, the sentiment engine or these rules change; rows carry the
+# version that scored them and `python app.py rescore` brings older ones up to date.
+SCORING_VERSION = 1
+
+CATEGORY_RULES = (
+    ("Monetary Policy", ("rbi", "interest", "policy", "inflation")),
+    ("IPO", ("ipo", "listing", "debut")),
+    ("Commodities", ("oil", "gold", "commodity")),
+    ("Banking", ("bank", "financial")),
+)
+
+def categorize(title):
+    tl = title.lower()
+    for category, words in CATEGORY_RULES:
+        if any(w in tl for w in words):
+            return category
+    return "Market News"
+
+def score_articles(items):
+    # items: (title, body, categorize_by_title); RSS items are categorized from the
+    # title, MarketAux ones are all "Market News". Returns the scored fields per item.
+    sentiments, scores, confidences = analyze_batch([title + " " + body for title, body, _ in items])
+    scored = []
+    for (title, _, by_title), sentiment, score, confidence in zip(items, sentiments, scores, confidences):
+        impact_score = abs(score) * 10
+        scored.append({
+            "sentiment": sentiment, "sentiment_score": score, "confidence": confidence,
+            "market_impact": "High" if impact_score >= 7 else ("Medium" if impact_score >= 4 else "Low"),
+            "impact_score": round(impact_score, 1),
+            "category": categorize(title) if by_title else "Market News",
+        })
+    return scored
+
+# ----- entity extraction -----
+# Canonical ticker -> aliases seen in headlines. SYMBOLS_PATH can point to a JSON
+# object of the same shape to replace it; every symbol also matches itself.
+DEFAULT_SYMBOLS = {
+    "NIFTY": ["nifty", "nifty 50", "nifty50"],
+    "BANKNIFTY": ["bank nifty", "nifty bank"],
+    "SENSEX": ["sensex", "bse sensex"],
+    "RELIANCE": ["reliance industries", "reliance", "ril", "reliance.bse"],
+    "INFY": ["infosys", "infy.bse"],
+    "TCS": ["tata consultancy services", "tata consultancy"],
+    "HDFCBANK": ["hdfc bank"],
+    "ICICIBANK": ["icici bank"],
+    "SBIN": ["state bank of india", "sbi"],
+    "HINDUNILVR": ["hindustan unilever", "hul"],
+    "ITC": [],
+    "LT": ["larsen & toubro", "larsen and toubro", "l&t"],
+    "BHARTIARTL": ["bharti airtel", "airtel"],
+    "TATAMOTORS": ["tata motors"],
+    "ADANIENT": ["adani enterprises"],
+    "WIPRO": ["wipro"],
+}
+
+def load_symbol_dictionary(path=None):
+    path = SYMBOLS_PATH if path is None else path
+    if not path:
+        return DEFAULT_SYMBOLS
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        logging.exception("Could not load symbol dictionary %s; using the built-in one", path)
+        return DEFAULT_SYMBOLS
+    return {str(symbol).upper(): list(aliases) for symbol, aliases in data.items()}
+
+class EntityExtractor:
+    # Every alias is compiled into one matcher (the same automaton as the sentiment
+    # lexicon) and only whole-word hits count, so "ril" does not fire inside "april".
+    def __init__(self, symbols):
+        self._aliases = {}
+        for symbol, aliases in symbols.items():
+            for alias in [symbol] + list(aliases):
+                self._aliases.setdefault(alias.lower(), set()).add(symbol.upper())
+        self._automaton = None
+        self._alias_re = None
+        if ahocorasick is not None and self._aliases:
+            self._automaton = ahocorasick.Automaton()
+            for alias, found in self._aliases.items():
+                self._automaton.add_word(alias, (len(alias), frozenset(found)))
+            self._automaton.make_automaton()
+        elif self._aliases:
+            alternation = "|".join(re.escape(a) for a in sorted(self._aliases, key=len, reverse=True))
+            self._alias_re = re.compile(r"(?<!\w)(?:%s)(?!\w)" % alternation)
+
+    def extract(self, text):
+        text = text.lower()
+        found = set()
+        if self._automaton is not None:
+            for end, (length, symbols) in self._automaton.iter(text):
+                start = end - length + 1
+                if ((start == 0 or not _is_word_char(text[start - 1]))
+                        and (end + 1 == len(text) or not _is_word_char(text[end + 1]))):
+                    found |= symbols
+        elif self._alias_re is not None:
+            for m in self._alias_re.finditer(text):
+                found |= self._aliases[m.group(0)]
+        return sorted(found)
+
+ENTITY_EXTRACTOR = EntityExtractor(load_symbol_dictionary())
+
+def extract_symbols(text):
+    return ENTITY_EXTRACTOR.extract(text)
+
+# ----- DB connections -----
+# Each thread keeps one read-only connection; all writes go through a single writer
+# connection serialised by a lock. With WAL, readers never wait on the writer.
+_DB_LOCAL = threading.local()
+_DB_WRITE_LOCK = threading.RLock()
+_DB_WRITER = {}
+
+def _connect(readonly=False):
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None, check_same_thread=False,
+                           cached_statements=SQLITE_STATEMENT_CACHE)
+    if not readonly:
+        # Only takes effect on a new database; compact_database() converts old ones
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            logging.warning("Could not enable WAL on %s", DB_PATH)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.execute("PRAGMA cache_size=-%d" % SQLITE_CACHE_SIZE_KB)
+    conn.execute("PRAGMA mmap_size=%d" % SQLITE_MMAP_SIZE)
+    conn.execute("PRAGMA temp_store=MEMORY")
+    if readonly:
+        conn.execute("PRAGMA query_only=ON")
+    return conn
+
+def _connection_key():
+    # Connections never cross a fork (gunicorn --preload) or a DB_PATH change
+    return os.getpid(), DB_PATH
+
+def get_read_connection():
+    key = _connection_key()
+    if getattr(_DB_LOCAL, "key", None) != key:
+        _DB_LOCAL.conn = _connect(readonly=True)
+        _DB_LOCAL.key = key
+    return _DB_LOCAL.conn
+
+def _writer_connection():
+    # Caller holds _DB_WRITE_LOCK
+    key = _connection_key()
+    if _DB_WRITER.get("key") != key:
+        _DB_WRITER.update(key=key, conn=_connect())
+    return _DB_WRITER["conn"]
+
+@contextmanager
+def write_transaction():
+    with _DB_WRITE_LOCK:
+        conn = _writer_connection()
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
+        try:
+            yield cur
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+def run_maintenance(sql):
+    # Statements that cannot run inside a transaction (VACUUM, incremental_vacuum, checkpoints)
+    with _DB_WRITE_LOCK:
+        return _writer_connection().execute(sql).fetchall()
+
+def incremental_vacuum():
+    # executescript steps the pragma to completion; execute() frees a single page
+    with _DB_WRITE_LOCK:
+        _writer_connection().executescript("PRAGMA incremental_vacuum;")
+
+def close_db_connections():
+    with _DB_WRITE_LOCK:
+        if _DB_WRITER.get("conn") is not None:
+            _DB_WRITER["conn"].close()
+        _DB_WRITER.clear()
+    if getattr(_DB_LOCAL, "conn", None) is not None:
+        _DB_LOCAL.conn.close()
+        _DB_LOCAL.conn = _DB_LOCAL.key = None
 
 # ----- DB init -----
 def init_db():
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    cur = conn.cursor()
-    try:
-        cur.execute("PRAGMA journal_mode=WAL;")
-    except Exception:
-        pass
+    # Schema changes commit together; backfills then run MIGRATION_BATCH_ROWS rows per
+    # transaction. Run it once per deploy (`python app.py migrate`, gunicorn's
+    # on_starting hook), never in each web worker where it would race the boot timeout.
+    with write_transaction() as cur:
+        create_tables(cur)
+        run_backfills(cur)
+    logging.info("DB initialized at %s", DB_PATH)
+
+def create_tables(cur):
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS app_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER
+        )
+    ''')
     cur.execute('''
         CREATE TABLE IF NOT EXISTS news_articles (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -146,137 +776,1085 @@ def init_db():
             timestamp DATETIME,
             url TEXT,
             content TEXT,
+            ts INTEGER,
+            cluster_id INTEGER,
+            scoring_version INTEGER,
             UNIQUE(title, source)
         )
     ''')
-    conn.commit()
-    conn.close()
-    logging.info("DB initialized at %s", DB_PATH)
+    migrate_article_timestamps(cur)
+    if "scoring_version" not in table_columns(cur, "news_articles"):
+        # NULL: scored before versions were recorded, i.e. version 0
+        cur.execute("ALTER TABLE news_articles ADD COLUMN scoring_version INTEGER")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_ts ON news_articles (ts)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_region_ts ON news_articles (region, ts)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_category_ts ON news_articles (category, ts)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_articles_source_ts ON news_articles (source, ts)")
+    create_rollup_table(cur)
+    create_search_index(cur)
+    create_cluster_index(cur)
+    create_symbol_index(cur)
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS metric_values (
+            name TEXT NOT NULL,
+            labels TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value REAL NOT NULL,
+            PRIMARY KEY (name, labels, field)
+        ) WITHOUT ROWID
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS leases (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            acquired_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            job_id TEXT
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS fetch_jobs (
+            id TEXT PRIMARY KEY,
+            trigger TEXT,
+            status TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            articles INTEGER,
+            inserted INTEGER,
+            sources TEXT,
+            error TEXT,
+            joined INTEGER NOT NULL DEFAULT 0,
+            requested TEXT,
+            holder TEXT
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS source_state (
+            source TEXT PRIMARY KEY,
+            interval REAL NOT NULL,
+            next_due REAL NOT NULL,
+            rate REAL,
+            error_streak INTEGER NOT NULL DEFAULT 0,
+            budget_day TEXT,
+            requests_today INTEGER NOT NULL DEFAULT 0,
+            last_fetch REAL,
+            last_status TEXT
+        )
+    ''')
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS feed_cache (
+            source TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            content_hash TEXT,
+            checked_at TEXT
+        )
+    ''')
+    dedupe_article_text(cur)
+
+# ----- data generation -----
+# Bumped in the same transaction that stores new articles; anything derived from
+# news_articles (e.g. cached responses) is valid for exactly one generation.
+def bump_generation(cur):
+    cur.execute("INSERT INTO app_meta (key, value) VALUES ('generation', 1) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + 1")
+
+def get_generation():
+    row = get_read_connection().execute("SELECT value FROM app_meta WHERE key = 'generation'").fetchone()
+    return row[0] if row else 0
+
+# ----- leases -----
+# Time-limited named locks in the database shared by every process on the host:
+# "scheduler" elects the one process that runs APScheduler, "fetch" keeps ingest
+# runs from overlapping across gunicorn workers and names the job running under it.
+PROCESS_ID = "%s:%d:%s" % (socket.gethostname(), os.getpid(), uuid.uuid4().hex[:6])
+
+def acquire_lease(name, holder, ttl):
+    # Takes or renews the lease; False while another holder's lease is unexpired
+    now = time.time()
+    with write_transaction() as cur:
+        row = cur.execute("SELECT holder, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+        if row and row[0] != holder and row[1] > now:
+            return False
+        acquired_at = now if not row or row[0] != holder else None
+        cur.execute("INSERT INTO leases (name, holder, acquired_at, expires_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at, "
+                    "acquired_at = COALESCE(?, acquired_at)", (name, holder, now, now + ttl, acquired_at))
+    return True
+
+def release_lease(name, holder):
+    with write_transaction() as cur:
+        cur.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, holder))
+
+def dedupe_article_text(cur):
+    # content is stored as NULL when it only repeats summary (always the case for RSS
+    # items); readers go through select_columns(). One-off for rows stored before that.
+    if cur.execute("SELECT 1 FROM app_meta WHERE key = 'content_deduped'").fetchone():
+        return
+    schedule_backfill(cur, "content")
+    cur.execute("INSERT INTO app_meta (key, value) VALUES ('content_deduped', 1)")
+
+def _dedupe_content_batch(cur, rows):
+    ids = [article_id for article_id, summary, content in rows if content is not None and content == summary]
+    if not ids:
+        return
+    marks = ",".join("?" * len(ids))
+    # External-content FTS entries are replaced with the values that were indexed;
+    # while the index is still being backfilled these rows are not in it yet
+    reindex = has_search_index(cur) and not backfill_pending(cur, "search")
+    if reindex:
+        cur.execute("INSERT INTO news_fts (news_fts, rowid, title, summary, content) "
+                    "SELECT 'delete', id, title, summary, content FROM news_articles WHERE id IN (%s)" % marks, ids)
+    cur.execute("UPDATE news_articles SET content = NULL WHERE id IN (%s)" % marks, ids)
+    if reindex:
+        cur.execute("INSERT INTO news_fts (rowid, title, summary, content) "
+                    "SELECT id, title, summary, content FROM news_articles WHERE id IN (%s)" % marks, ids)
+
+# ----- backfills -----
+# Work over existing rows that a schema change needs (new columns, indexes and
+# derived tables) is scheduled when the change is made and done by run_backfills():
+# news_articles in id order, MIGRATION_BATCH_ROWS rows per committed transaction,
+# up to the last id present when it was scheduled (later rows are handled by the
+# ingest path). Progress is kept in app_meta, so an interrupted run resumes.
+MIGRATION_BATCH_ROWS = int(os.getenv("MIGRATION_BATCH_ROWS", "5000"))
+
+def schedule_backfill(cur, name):
+    until = cur.execute("SELECT COALESCE(MAX(id), 0) FROM news_articles").fetchone()[0]
+    if until:
+        cur.executemany("INSERT OR REPLACE INTO app_meta (key, value) VALUES (?, ?)",
+                        [("backfill:%s" % name, 0), ("backfill:%s:until" % name, until)])
+
+def backfill_pending(cur, name):
+    return cur.execute("SELECT 1 FROM app_meta WHERE key = ?", ("backfill:%s" % name,)).fetchone() is not None
+
+def _commit_batch(cur):
+    # Lets other writers in between batches and makes the progress so far durable
+    cur.execute("COMMIT")
+    cur.execute("BEGIN IMMEDIATE")
+
+def run_backfills(cur):
+    # Runs inside write_transaction(); commits after every batch
+    for name, columns, apply in BACKFILLS:
+        meta = dict(cur.execute("SELECT key, value FROM app_meta WHERE key IN (?, ?)",
+                                ("backfill:%s" % name, "backfill:%s:until" % name)).fetchall())
+        if "backfill:%s" % name not in meta:
+            continue
+        done, until = meta["backfill:%s" % name], meta.get("backfill:%s:until" % name, 0)
+        logging.info("Backfilling %s for articles %d-%d", name, done + 1, until)
+        while done < until:
+            rows = cur.execute("SELECT id, %s FROM news_articles WHERE id > ? AND id <= ? ORDER BY id LIMIT ?"
+                               % columns, (done, until, MIGRATION_BATCH_ROWS)).fetchall()
+            if rows:
+                apply(cur, rows)
+            done = rows[-1][0] if rows else until
+            cur.execute("UPDATE app_meta SET value = ? WHERE key = ?", (done, "backfill:%s" % name))
+            _commit_batch(cur)
+        cur.execute("DELETE FROM app_meta WHERE key IN (?, ?)", ("backfill:%s" % name, "backfill:%s:until" % name))
+
+def table_columns(cur, table):
+    return {row[1] for row in cur.execute("PRAGMA table_info(%s)" % table)}
+
+def migrate_article_timestamps(cur):
+    # Older databases only have the mixed-format TEXT timestamp; add and backfill the
+    # integer epoch column that all ordering and pagination use.
+    if "ts" in table_columns(cur, "news_articles"):
+        return
+    logging.info("Migrating news_articles: adding epoch ts column")
+    cur.execute("ALTER TABLE news_articles ADD COLUMN ts INTEGER")
+    schedule_backfill(cur, "ts")
+
+def _backfill_ts(cur, rows):
+    cur.executemany("UPDATE news_articles SET ts = ? WHERE id = ?",
+                    [(timestamp_to_epoch(ts) or 0, article_id) for article_id, ts in rows])
+
+# ----- sentiment rollups -----
+# Per hour x region x category x source counters, maintained by the ingest
+# transaction so aggregate queries never touch news_articles.
+ROLLUP_BUCKET_SECONDS = 3600
+ROLLUP_GROUPS = ("region", "category", "source", "hour")
+
+def create_rollup_table(cur):
+    exists = cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sentiment_rollups'").fetchone()
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS sentiment_rollups (
+            bucket INTEGER NOT NULL,
+            region TEXT NOT NULL,
+            category TEXT NOT NULL,
+            source TEXT NOT NULL,
+            articles INTEGER NOT NULL DEFAULT 0,
+            positive INTEGER NOT NULL DEFAULT 0,
+            negative INTEGER NOT NULL DEFAULT 0,
+            neutral INTEGER NOT NULL DEFAULT 0,
+            score_sum REAL NOT NULL DEFAULT 0,
+            confidence_sum REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (bucket, region, category, source)
+        ) WITHOUT ROWID
+    ''')
+    if not exists:
+        schedule_backfill(cur, "rollups")
+
+def update_rollups(cur, rows, sign=1):
+    # rows: (ts, region, category, source, sentiment, sentiment_score, confidence);
+    # sign=-1 takes previously counted rows back out.
+    apply_rollup_deltas(cur, rollup_deltas(rows, sign))
+
+def rollup_deltas(rows, sign=1, deltas=None):
+    # Adds the rows' counters (times sign) into deltas, {rollup key: counters}
+    deltas = {} if deltas is None else deltas
+    for ts, region, category, source, sentiment, score, confidence in rows:
+        key = ((ts // ROLLUP_BUCKET_SECONDS) * ROLLUP_BUCKET_SECONDS, region or "", category or "", source or "")
+        d = deltas.setdefault(key, [0, 0, 0, 0, 0.0, 0.0])
+        d[0] += sign
+        d[1 if sentiment == "Positive" else 2 if sentiment == "Negative" else 3] += sign
+        d[4] += sign * (score or 0.0)
+        d[5] += sign * (confidence or 0)
+    return deltas
+
+def apply_rollup_deltas(cur, deltas):
+    cur.executemany('''
+        INSERT INTO sentiment_rollups
+        (bucket, region, category, source, articles, positive, negative, neutral, score_sum, confidence_sum)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(bucket, region, category, source) DO UPDATE SET
+            articles = articles + excluded.articles, positive = positive + excluded.positive,
+            negative = negative + excluded.negative, neutral = neutral + excluded.neutral,
+            score_sum = score_sum + excluded.score_sum, confidence_sum = confidence_sum + excluded.confidence_sum
+    ''', [key + tuple(d) for key, d in deltas.items()])
+
+def _rollup_summary(articles, positive, negative, neutral, score_sum, confidence_sum):
+    articles = articles or 0
+    return {
+        "articles": articles, "positive": positive or 0, "negative": negative or 0, "neutral": neutral or 0,
+        "avg_score": round(score_sum / articles, 4) if articles else 0.0,
+        "avg_confidence": round(confidence_sum / articles, 1) if articles else 0.0,
+    }
+
+def query_rollups(start=None, end=None, region=None, category=None, source=None, group_by=None):
+    # Cost depends on the number of hour buckets in range, not on the article count
+    if group_by and group_by not in ROLLUP_GROUPS:
+        raise ValueError("group_by must be one of %s" % ", ".join(ROLLUP_GROUPS))
+    where, params = ["1=1"], []
+    if start is not None:
+        where.append("bucket >= ?")
+        params.append((start // ROLLUP_BUCKET_SECONDS) * ROLLUP_BUCKET_SECONDS)
+    if end is not None:
+        where.append("bucket < ?")
+        params.append(end)
+    for column, value in (("region", region), ("category", category), ("source", source)):
+        if value and value != "all":
+            where.append("%s = ?" % column)
+            params.append(value)
+    sums = "SUM(articles), SUM(positive), SUM(negative), SUM(neutral), TOTAL(score_sum), TOTAL(confidence_sum)"
+    cur = get_read_connection().cursor()
+    with METRICS.timer("newsapp_db_query_seconds", query="rollups"):
+        totals = cur.execute("SELECT %s FROM sentiment_rollups WHERE %s" % (sums, " AND ".join(where)),
+                             params).fetchone()
+        rows = []
+        if group_by:
+            column = "bucket" if group_by == "hour" else group_by
+            rows = cur.execute("SELECT %s, %s FROM sentiment_rollups WHERE %s GROUP BY 1 ORDER BY 1"
+                               % (column, sums, " AND ".join(where)), params).fetchall()
+    result = {"start": start, "end": end, "totals": _rollup_summary(*totals)}
+    if group_by:
+        result["group_by"] = group_by
+        result["groups"] = [dict(_rollup_summary(*r[1:]), **{group_by: r[0]}) for r in rows]
+    return result
+
+# ----- full-text search -----
+# External-content FTS5 index over news_articles; rows are added by the ingest
+# transaction. Builds of SQLite without FTS5 simply run without search.
+_FTS_TABLES = {}
+
+def create_search_index(cur):
+    exists = has_search_index(cur)
+    if not exists:
+        try:
+            cur.execute('''
+                CREATE VIRTUAL TABLE news_fts USING fts5(
+                    title, summary, content,
+                    content='news_articles', content_rowid='id', tokenize='porter unicode61'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            logging.warning("SQLite was built without FTS5; /api/search is disabled")
+            return
+        schedule_backfill(cur, "search")
+        _FTS_TABLES[DB_PATH] = True
+
+def _backfill_search(cur, rows):
+    cur.executemany("INSERT INTO news_fts (rowid, title, summary, content) VALUES (?, ?, ?, ?)", rows)
+
+def has_search_index(cur):
+    if DB_PATH not in _FTS_TABLES:
+        _FTS_TABLES[DB_PATH] = cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'").fetchone() is not None
+    return _FTS_TABLES[DB_PATH]
+
+def index_articles_for_search(cur, after_id):
+    if has_search_index(cur):
+        cur.execute("INSERT INTO news_fts (rowid, title, summary, content) "
+                    "SELECT id, title, summary, content FROM news_articles WHERE id > ?", (after_id,))
+
+def _quote_fts_query(query):
+    return " ".join('"%s"' % term.replace('"', '""') for term in query.split())
+
+def search_articles(query, limit=20, offset=0, region=None, category=None):
+    # BM25-ranked (title weighted over summary over content) with a highlighted snippet
+    cur = get_read_connection().cursor()
+    if not has_search_index(cur):
+        raise RuntimeError("full-text search is not available")
+    columns = select_columns(ARTICLE_COLUMNS, "a")
+    sql = ("SELECT %s, snippet(news_fts, -1, '<mark>', '</mark>', '...', 16), bm25(news_fts, 10.0, 4.0, 1.0) AS rank "
+           "FROM news_fts JOIN news_articles a ON a.id = news_fts.rowid WHERE news_fts MATCH ?" % columns)
+    params = []
+    for column, value in (("region", region), ("category", category)):
+        if value and value != "all":
+            sql += " AND a.%s = ?" % column
+            params.append(value)
+    sql += " ORDER BY rank LIMIT ? OFFSET ?"
+    params.extend([limit, offset])
+    with METRICS.timer("newsapp_db_query_seconds", query="search"):
+        try:
+            rows = cur.execute(sql, [query] + params).fetchall()
+        except sqlite3.OperationalError:
+            # Not valid FTS5 query syntax; search for the plain terms instead
+            rows = cur.execute(sql, [_quote_fts_query(query)] + params).fetchall()
+    results = []
+    for r in rows:
+        article = dict(zip(ARTICLE_COLUMNS, r))
+        article["snippet"] = r[len(ARTICLE_COLUMNS)]
+        article["rank"] = round(r[len(ARTICLE_COLUMNS) + 1], 4)
+        results.append(article)
+    return results
+
+# ----- near-duplicate clustering -----
+# Outlets carrying the same story usually keep most of the headline or most of the
+# summary, rarely both, so each is compared on its own: two articles are the same
+# story when their title or summary word sets reach CLUSTER_MIN_SIMILARITY Jaccard
+# similarity and their titles do not contradict each other (different figures,
+# opposite directions, different companies). Candidates come from MinHash LSH:
+# every article puts one bucket per permutation and field into minhash_bands, so a
+# pair at Jaccard J shares a bucket with probability 1 - (1 - J)^8 (0.996 at 0.5).
+# The index only holds articles inside the CLUSTER_WINDOW_HOURS matching window,
+# so it stays small however large the archive gets. Each cluster is identified by
+# the id of its first article, its representative.
+_MINHASH_PERMUTATIONS = 8
+_MINHASH_PRIME = (1 << 61) - 1
+_MINHASH_PARAMS = [(int.from_bytes(hashlib.blake2b(b"minhash-a%d" % i, digest_size=8).digest(), "big")
+                    % (_MINHASH_PRIME - 1) + 1,
+                    int.from_bytes(hashlib.blake2b(b"minhash-b%d" % i, digest_size=8).digest(), "big")
+                    % _MINHASH_PRIME) for i in range(_MINHASH_PERMUTATIONS)]
+# Summaries shorter than this are boilerplate too often to identify a story
+_MIN_SUMMARY_TOKENS = 8
+_CLUSTER_STOPWORDS = frozenset("a an and as at by for from in is it its of on or the to with after over says".split())
+_CLUSTER_WORD_RE = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*")
+_NUMBER_RE = re.compile(r"[0-9]+(?:[.,][0-9]+)*$")
+_UP_WORDS = frozenset("rise rises rose jump jumps gain gains surge surges climb climbs higher up rally rallies "
+                      "raise raises hike hikes lift lifts".split())
+_DOWN_WORDS = frozenset("fall falls fell drop drops slip slips decline declines plunge plunges lower down cut "
+                        "cuts slump slumps sink sinks".split())
+# Permuted hashes of recently seen tokens; news vocabulary repeats heavily
+_MINHASH_TOKENS = {}
+
+def cluster_tokens(text):
+    # Lower-cased words without stopwords, plural "s" dropped; figures such as
+    # "19,323" or "6.5" stay one token
+    tokens = set()
+    for word in _CLUSTER_WORD_RE.findall((text or "").lower()):
+        if word in _CLUSTER_STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.add(word)
+    return tokens
+
+def minhash(tokens):
+    values = []
+    for token in tokens:
+        permuted = _MINHASH_TOKENS.get(token)
+        if permuted is None:
+            h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+            permuted = tuple(((a * h + b) % _MINHASH_PRIME) & 0xFFFFFFFF for a, b in _MINHASH_PARAMS)
+            if len(_MINHASH_TOKENS) >= 200000:
+                _MINHASH_TOKENS.clear()
+            _MINHASH_TOKENS[token] = permuted
+        values.append(permuted)
+    return [min(column) for column in zip(*values)]
+
+def cluster_keys(title, summary):
+    # (band, bucket) LSH keys: bands 0-7 from the title, 8-15 from the summary
+    keys = [(band, bucket) for band, bucket in enumerate(minhash(cluster_tokens(title)))]
+    summary_tokens = cluster_tokens(summary)
+    if len(summary_tokens) >= _MIN_SUMMARY_TOKENS:
+        keys.extend((_MINHASH_PERMUTATIONS + band, bucket) for band, bucket in enumerate(minhash(summary_tokens)))
+    return keys
+
+def story_features(title, summary):
+    words = set(_CLUSTER_WORD_RE.findall((title or "").lower()))
+    summary_tokens = cluster_tokens(summary)
+    return {"title": cluster_tokens(title),
+            "summary": summary_tokens if len(summary_tokens) >= _MIN_SUMMARY_TOKENS else set(),
+            "numbers": {w for w in words if _NUMBER_RE.match(w)},
+            "direction": (bool(words & _UP_WORDS), bool(words & _DOWN_WORDS)),
+            "symbols": set(extract_symbols(title or ""))}
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+def story_similarity(a, b):
+    # Jaccard similarity of the closer field, or 0 when the titles contradict
+    if (a["numbers"] - b["numbers"]) and (b["numbers"] - a["numbers"]):
+        return 0.0
+    if a["direction"] in ((True, False), (False, True)) and b["direction"] == a["direction"][::-1]:
+        return 0.0
+    if a["symbols"] and b["symbols"] and not a["symbols"] & b["symbols"]:
+        return 0.0
+    return max(_jaccard(a["title"], b["title"]), _jaccard(a["summary"], b["summary"]))
+
+def create_cluster_index(cur):
+    if "cluster_id" not in table_columns(cur, "news_articles"):
+        cur.execute("ALTER TABLE news_articles ADD COLUMN cluster_id INTEGER")
+        # Cluster the articles stored before clustering existed
+        schedule_backfill(cur, "clusters")
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS minhash_bands (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            article_id INTEGER NOT NULL,
+            ts INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, article_id)
+        ) WITHOUT ROWID
+    ''')
+
+def assign_clusters(cur, rows):
+    # rows: (id, ts, title, summary, cluster_keys) in id order. Joins each article to
+    # the cluster of its most similar story seen within CLUSTER_WINDOW_HOURS, or starts
+    # a new cluster. Candidates for the whole batch are read up front; rows of the
+    # batch itself are added to the in-memory buckets as they are assigned.
+    if not rows:
+        return []
+    window = CLUSTER_WINDOW_HOURS * 3600
+    keys_by_band = {}
+    for row in rows:
+        for band, bucket in row[4]:
+            keys_by_band.setdefault(band, set()).add(bucket)
+    oldest = min(r[1] or 0 for r in rows) - window
+    buckets = {}
+    for band, keys in keys_by_band.items():
+        keys = list(keys)
+        for i in range(0, len(keys), KEY_LOOKUP_CHUNK):
+            chunk = keys[i:i + KEY_LOOKUP_CHUNK]
+            for bucket, article_id in cur.execute(
+                    "SELECT bucket, article_id FROM minhash_bands WHERE band = ? AND bucket IN (%s) AND ts >= ?"
+                    % ",".join("?" * len(chunk)), [band] + chunk + [oldest]):
+                buckets.setdefault((band, bucket), []).append(article_id)
+    for ids in buckets.values():
+        ids.sort()
+    known = {}
+    candidate_ids = list({i for ids in buckets.values() for i in ids})
+    for i in range(0, len(candidate_ids), KEY_LOOKUP_CHUNK):
+        chunk = candidate_ids[i:i + KEY_LOOKUP_CHUNK]
+        for other_id, other_ts, title, summary, other_cluster in cur.execute(
+                "SELECT id, ts, title, summary, cluster_id FROM news_articles WHERE id IN (%s)"
+                % ",".join("?" * len(chunk)), chunk):
+            if other_cluster is not None:
+                known[other_id] = (other_ts or 0, story_features(title, summary), other_cluster)
+
+    assignments, band_rows = [], []
+    for article_id, ts, title, summary, keys in rows:
+        ts = ts or 0
+        features = story_features(title, summary)
+        cluster_id, best, seen = article_id, CLUSTER_MIN_SIMILARITY, set()
+        for key in keys:
+            # newest first; ids follow ingest order, so stop once outside the window
+            for other_id in reversed(buckets.get(key, ())):
+                other = known.get(other_id)
+                if other is None or other_id in seen:
+                    continue
+                if ts - other[0] > window:
+                    break
+                seen.add(other_id)
+                if abs(ts - other[0]) > window:
+                    continue
+                similarity = story_similarity(features, other[1])
+                if similarity > best or (similarity == best and other[2] < cluster_id):
+                    cluster_id, best = other[2], similarity
+        known[article_id] = (ts, features, cluster_id)
+        for key in keys:
+            buckets.setdefault(key, []).append(article_id)
+            band_rows.append((key[0], key[1], article_id, ts))
+        assignments.append((cluster_id, article_id))
+    cur.executemany("UPDATE news_articles SET cluster_id = ? WHERE id = ?", assignments)
+    cur.executemany("INSERT OR IGNORE INTO minhash_bands (band, bucket, article_id, ts) VALUES (?, ?, ?, ?)", band_rows)
+    cur.execute("DELETE FROM minhash_bands WHERE ts < ?", (max(r[1] or 0 for r in rows) - window,))
+    return [(article_id, cluster_id) for cluster_id, article_id in assignments]
+
+# ----- symbol index -----
+# article_symbols maps each extracted ticker to its articles and is written in the
+# same transaction as them. A ticker's newest-first page is one range scan of the
+# (symbol, ts, article_id) primary key.
+def create_symbol_index(cur):
+    exists = cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_symbols'").fetchone()
+    cur.execute('''
+        CREATE TABLE IF NOT EXISTS article_symbols (
+            symbol TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            article_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol, ts, article_id)
+        ) WITHOUT ROWID
+    ''')
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_article_symbols_article ON article_symbols (article_id)")
+    if not exists:
+        # Index the articles stored before symbol extraction existed
+        schedule_backfill(cur, "symbols")
+
+def _backfill_symbols(cur, rows):
+    index_article_symbols(cur, [(i, ts, extract_symbols(title + " " + (summary or ""))) for i, ts, title, summary in rows])
+
+# In run order: later backfills read ts and the deduplicated content
+BACKFILLS = (
+    ("ts", "timestamp", _backfill_ts),
+    ("content", "summary, content", _dedupe_content_batch),
+    ("rollups", "ts, region, category, source, sentiment, sentiment_score, confidence",
+     lambda cur, rows: update_rollups(cur, [row[1:] for row in rows])),
+    ("search", "title, summary, content", _backfill_search),
+    ("symbols", "ts, title, summary", _backfill_symbols),
+    ("clusters", "ts, title, summary",
+     lambda cur, rows: assign_clusters(cur, [row + (cluster_keys(row[2], row[3]),) for row in rows])),
+)
+
+def index_article_symbols(cur, rows):
+    # rows: (article_id, ts, symbols)
+    cur.executemany("INSERT OR IGNORE INTO article_symbols (symbol, ts, article_id) VALUES (?, ?, ?)",
+                    [(symbol, ts, article_id) for article_id, ts, symbols in rows for symbol in symbols])
+
+def get_symbol_articles(symbol, limit=50, before=None, dedupe=False):
+    # Same ordering and cursor as get_articles_from_db
+    query = ("SELECT %s FROM article_symbols s JOIN news_articles a ON a.id = s.article_id WHERE s.symbol = ?"
+             % select_columns(ARTICLE_COLUMNS, "a"))
+    params = [symbol.upper()]
+    if dedupe:
+        query += " AND a.cluster_id = a.id"
+    if before:
+        query += " AND (s.ts, s.article_id) < (?, ?)"
+        params.extend(parse_cursor(before))
+    query += " ORDER BY s.ts DESC, s.article_id DESC LIMIT ?"
+    params.append(limit)
+    with METRICS.timer("newsapp_db_query_seconds", query="symbol_articles"):
+        rows = get_read_connection().execute(query, params).fetchall()
+    return [dict(zip(ARTICLE_COLUMNS, r)) for r in rows]
+
+# ----- sentiment time series -----
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+def parse_duration(value, default):
+    # "900", "15m", "1h", "1d" -> seconds
+    if value is None or value == "":
+        return default
+    value = value.strip().lower()
+    unit = DURATION_UNITS.get(value[-1:])
+    try:
+        seconds = int(float(value[:-1] if unit else value) * (unit or 1))
+    except ValueError:
+        raise ValueError("invalid duration: %s" % value)
+    if seconds <= 0:
+        raise ValueError("duration must be positive: %s" % value)
+    return seconds
+
+def load_sentiment_columns(start, end, region=None, category=None, source=None, symbol=None):
+    # (ts, sentiment_score, confidence) as one float64 array of shape (n, 3)
+    if symbol:
+        sql = ("SELECT s.ts, a.sentiment_score, a.confidence FROM article_symbols s "
+               "JOIN news_articles a ON a.id = s.article_id WHERE s.symbol = ? AND s.ts >= ? AND s.ts < ?")
+        params = [symbol.upper(), start, end]
+        prefix = "a."
+    else:
+        sql = "SELECT ts, sentiment_score, confidence FROM news_articles WHERE ts >= ? AND ts < ?"
+        params = [start, end]
+        prefix = ""
+    for column, value in (("region", region), ("category", category), ("source", source)):
+        if value and value != "all":
+            sql += " AND %s%s = ?" % (prefix, column)
+            params.append(value)
+    with METRICS.timer("newsapp_db_query_seconds", query="timeseries"):
+        rows = get_read_connection().execute(sql, params).fetchall()
+    return np.array(rows, dtype=np.float64).reshape(-1, 3)
+
+def sentiment_timeseries(start, end, bucket=3600, max_points=500, window=6, region=None, category=None,
+                         source=None, symbol=None):
+    # Buckets are aligned to multiples of the bucket width. When the range would need
+    # more than max_points buckets the width grows to a multiple of the requested one,
+    # which downsamples exactly (sums and counts just merge). rolling_mean covers the
+    # last `window` buckets weighted by article count; ema runs over the bucket means
+    # with alpha = 2 / (window + 1), carrying over empty buckets.
+    requested, factor = bucket, 1
+    while True:
+        bucket = requested * factor
+        aligned = start - start % bucket
+        n = -(-max(end - aligned, 1) // bucket)
+        if n <= max_points:
+            break
+        # Aligning the wider bucket can add one more; the loop then widens again
+        factor = max(factor + 1, -(-(end - aligned) // (requested * max_points)))
+    start = aligned
+    data = load_sentiment_columns(start, end, region, category, source, symbol)
+    idx = ((data[:, 0] - start) // bucket).astype(np.int64)
+    counts = np.bincount(idx, minlength=n)[:n].astype(np.float64)
+    score_sum = np.bincount(idx, weights=data[:, 1], minlength=n)[:n]
+    conf_sum = np.bincount(idx, weights=data[:, 2], minlength=n)[:n]
+    weighted_sum = np.bincount(idx, weights=data[:, 1] * data[:, 2], minlength=n)[:n]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = score_sum / counts
+        weighted = weighted_sum / conf_sum
+        cum_scores = np.concatenate(([0.0], np.cumsum(score_sum)))
+        cum_counts = np.concatenate(([0.0], np.cumsum(counts)))
+        lo = np.maximum(np.arange(1, n + 1) - window, 0)
+        rolling = (cum_scores[1:] - cum_scores[lo]) / (cum_counts[1:] - cum_counts[lo])
+    alpha = 2.0 / (window + 1)
+    ema = np.full(n, np.nan)
+    level = np.nan
+    for i in np.flatnonzero(counts):
+        level = mean[i] if np.isnan(level) else alpha * mean[i] + (1 - alpha) * level
+        ema[i] = level
+    # Empty buckets keep the last EMA value once the index has started
+    filled = np.maximum.accumulate(np.where(np.isnan(ema), -1, np.arange(n)))
+    ema = np.where(filled >= 0, ema[np.maximum(filled, 0)], np.nan)
+
+    def column(values):
+        return [None if v != v else round(float(v), 4) for v in values]
+
+    return {
+        "start": int(start), "end": int(end), "bucket_seconds": int(bucket), "requested_bucket_seconds": int(requested),
+        "downsampled": bucket != requested, "window": window, "articles": int(counts.sum()),
+        "series": {
+            "t": [int(start + i * bucket) for i in range(n)],
+            "count": [int(c) for c in counts],
+            "mean_score": column(mean),
+            "weighted_score": column(weighted),
+            "rolling_mean": column(rolling),
+            "ema": column(ema),
+        },
+    }
 
 # ----- RSS fetch -----
-def fetch_rss_news(source_name, source_config, limit_per_feed=10):
+def rss_source_label(source_name):
+    return source_name.replace("_", " ").title()
+
+def fetch_rss_news(source_name, source_config, limit_per_feed=10, session=None, stats=None):
     articles = []
+    stats = stats if stats is not None else {}
     try:
-        feed = feedparser.parse(source_config["url"])
+        session = session or get_http_session()
+        body = conditional_get(session, source_name, source_config["url"], stats,
+                               timeout=source_config.get("timeout", SOURCE_TIMEOUT))
+        if body is None:
+            return articles
+        with METRICS.timer("newsapp_fetch_stage_seconds", source=source_name, stage="parse"):
+            feed = feedparser.parse(body)
+        entries = []
         for entry in feed.entries[:limit_per_feed]:
             title = (entry.get("title") or "").strip()
             summary = entry.get("summary", entry.get("description", "") or "")
             summary = re.sub(r"<[^>]+>", "", summary)
             summary = summary[:300] + "..." if len(summary) > 300 else summary
-            sentiment, score, confidence = analyze_sentiment(title + " " + summary)
-            impact_score = abs(score) * 10
-            market_impact = "High" if impact_score >= 7 else ("Medium" if impact_score >= 4 else "Low")
-            category = "Market News"
-            tl = title.lower()
-            if any(w in tl for w in ["rbi", "interest", "policy", "inflation"]):
-                category = "Monetary Policy"
-            elif any(w in tl for w in ["ipo", "listing", "debut"]):
-                category = "IPO"
-            elif any(w in tl for w in ["oil", "gold", "commodity"]):
-                category = "Commodities"
-            elif any(w in tl for w in ["bank", "financial"]):
-                category = "Banking"
+            entries.append((title, summary, entry.get("link", "")))
+        with METRICS.timer("newsapp_fetch_stage_seconds", source=source_name, stage="sentiment"):
+            scored = score_articles([(title, summary, True) for title, summary, _ in entries])
+        for (title, summary, link), fields in zip(entries, scored):
             ts = datetime.now(IST_ZONE).strftime("%Y-%m-%d %H:%M:%S %z") if IST_ZONE else datetime.utcnow().isoformat()
-            articles.append({
-                "title": title, "summary": summary, "source": source_name.replace("_", " ").title(),
-                "category": category, "region": source_config.get("region", "Unknown"),
-                "sentiment": sentiment, "sentiment_score": score, "confidence": confidence,
-                "market_impact": market_impact, "impact_score": round(impact_score, 1),
-                "timestamp": ts, "url": entry.get("link", ""), "content": summary
-            })
+            articles.append(dict(fields, **{
+                "title": title, "summary": summary, "source": rss_source_label(source_name),
+                "region": source_config.get("region", "Unknown"), "timestamp": ts, "url": link, "content": summary,
+                "cluster_keys": cluster_keys(title, summary),
+                "symbols": extract_symbols(title + " " + summary),
+            }))
     except Exception as e:
         logging.exception("RSS fetch error for %s: %s", source_name, e)
+        stats["error"] = str(e)
     return articles
 
 # ----- MarketAux API fetch -----
-def fetch_api_news(session=None):
+# Same substring semantics as the keyword scan it replaced, in one regex pass
+INDIA_KEYWORDS = ("india", "indian", "mumbai", "nse", "bse", "rupee", "rbi")
+_INDIA_RE = re.compile("|".join(INDIA_KEYWORDS))
+
+def fetch_api_news(session=None, stats=None):
     articles = []
+    stats = stats if stats is not None else {}
     try:
-        session = session or make_requests_session()
+        session = session or get_http_session()
         conf = NEWS_SOURCES.get("marketaux", {})
         params = dict(conf.get("params", {}))
         params["api_token"] = MARKETAUX_API_TOKEN or params.get("api_token", "DEMO")
         params["limit"] = int(params.get("limit", 20))
-        resp = session.get(conf["url"], params=params, timeout=30)
-        if resp.status_code == 200:
-            data = resp.json()
+        body = conditional_get(session, "marketaux", conf["url"], stats, params=params,
+                               timeout=conf.get("timeout", SOURCE_TIMEOUT))
+        if body is not None:
+            with METRICS.timer("newsapp_fetch_stage_seconds", source="marketaux", stage="parse"):
+                data = json.loads(body)
             if isinstance(data, dict) and "data" in data:
-                for item in data["data"][: params["limit"]]:
-                    title = (item.get("title") or "").strip()
+                items = [item for item in data["data"][: params["limit"]] if (item.get("title") or "").strip()]
+                with METRICS.timer("newsapp_fetch_stage_seconds", source="marketaux", stage="sentiment"):
+                    scored = score_articles(
+                        [(item["title"].strip(), item.get("description") or "", False) for item in items])
+                for item, fields in zip(items, scored):
+                    title = item["title"].strip()
                     desc = item.get("description") or ""
-                    if not title:
-                        continue
-                    sentiment, score, confidence = analyze_sentiment(title + " " + desc)
-                    impact_score = abs(score) * 10
-                    market_impact = "High" if impact_score >= 7 else ("Medium" if impact_score >= 4 else "Low")
-                    region = "India" if any(w in title.lower() for w in ["india", "indian", "mumbai", "nse", "bse", "rupee", "rbi"]) else "Global"
+                    entities = [e for e in item.get("entities") or [] if isinstance(e, dict)]
+                    india = _INDIA_RE.search(title.lower()) or any(e.get("country") == "in" for e in entities)
+                    region = "India" if india else "Global"
+                    symbols = set(extract_symbols(title + " " + desc))
+                    symbols.update(e["symbol"].split(".")[0].upper() for e in entities if e.get("symbol"))
+                    summary = desc[:300] + "..." if len(desc) > 300 else desc
                     ts = datetime.now(IST_ZONE).strftime("%Y-%m-%d %H:%M:%S %z") if IST_ZONE else datetime.utcnow().isoformat()
-                    articles.append({
+                    articles.append(dict(fields, **{
                         "title": title,
-                        "summary": desc[:300] + "..." if len(desc) > 300 else desc,
+                        "summary": summary,
                         "source": item.get("source", "MarketAux"),
-                        "category": "Market News",
                         "region": region,
-                        "sentiment": sentiment,
-                        "sentiment_score": score,
-                        "confidence": confidence,
-                        "market_impact": market_impact,
-                        "impact_score": round(impact_score, 1),
                         "timestamp": ts,
                         "url": item.get("url", ""),
                         "content": desc,
-                    })
+                        "cluster_keys": cluster_keys(title, summary),
+                        "symbols": sorted(symbols),
+                    }))
             else:
                 logging.warning("MarketAux returned unexpected payload")
-        else:
-            logging.error("MarketAux request failed: %s %s", resp.status_code, resp.text[:200])
     except Exception as e:
         logging.exception("Error fetching MarketAux news: %s", e)
+        stats["error"] = str(e)
     return articles
 
 # ----- Save & combined fetch -----
+def timestamp_to_epoch(value):
+    # Stored timestamps are either "%Y-%m-%d %H:%M:%S %z" (IST) or a naive UTC isoformat()
+    if not value:
+        return None
+    try:
+        dt = datetime.strptime(value, "%Y-%m-%d %H:%M:%S %z")
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+ARTICLE_FIELDS = ("title", "summary", "source", "category", "region", "sentiment", "sentiment_score",
+                  "confidence", "market_impact", "impact_score", "timestamp", "url", "content")
+
+INSERT_ARTICLE_SQL = '''
+    INSERT OR IGNORE INTO news_articles
+    (title, summary, source, category, region, sentiment, sentiment_score,
+    confidence, market_impact, impact_score, timestamp, url, content, ts, scoring_version)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Titles per lookup statement; keeps us under SQLite's bound-variable limit
+KEY_LOOKUP_CHUNK = 500
+
+def find_existing_keys(cur, keys):
+    # "title IN (...)" is answered from the UNIQUE(title, source) index; the source half
+    # of the key is matched in Python.
+    wanted = set(keys)
+    titles = sorted({title for title, _ in wanted})
+    existing = set()
+    for i in range(0, len(titles), KEY_LOOKUP_CHUNK):
+        chunk = titles[i:i + KEY_LOOKUP_CHUNK]
+        cur.execute("SELECT title, source FROM news_articles WHERE title IN (%s)" % ",".join("?" * len(chunk)), chunk)
+        existing.update(key for key in cur.fetchall() if key in wanted)
+    return existing
+
+def article_symbols(art):
+    # Fetchers extract symbols up front (MarketAux adds its tagged entities); anything
+    # else is extracted here
+    if art.get("symbols") is not None:
+        return art["symbols"]
+    return extract_symbols(art["title"] + " " + (art["summary"] or ""))
+
 def save_articles_to_db(articles):
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    cur = conn.cursor()
-    saved = 0
+    # Drops in-batch duplicates and rows already stored with one set-based lookup, then
+    # inserts the rest with executemany in a single transaction. Returns the new row ids;
+    # each newly stored article dict also gets its "id".
+    batch = {}
     for art in articles:
         try:
-            cur.execute('''
-                INSERT OR IGNORE INTO news_articles
-                (title, summary, source, category, region, sentiment, sentiment_score,
-                confidence, market_impact, impact_score, timestamp, url, content)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (art["title"], art["summary"], art["source"], art["category"], art["region"],
-                  art["sentiment"], art["sentiment_score"], art["confidence"],
-                  art["market_impact"], art["impact_score"], art["timestamp"],
-                  art["url"], art["content"]))
-            if cur.rowcount > 0:
-                saved += 1
-        except Exception:
-            logging.exception("Failed to save article: %s", art.get("title"))
-    conn.commit()
-    conn.close()
-    logging.info("Saved %d new articles", saved)
-
-def fetch_all_news():
-    logging.info("Starting news fetch...")
-    all_articles = []
-    session = make_requests_session()
-    for name, conf in NEWS_SOURCES.items():
+            # content (last field) is stored as NULL when it repeats summary
+            row = tuple(art[f] for f in ARTICLE_FIELDS[:-1]) + (
+                None if art["content"] == art["summary"] else art["content"],
+                timestamp_to_epoch(art["timestamp"]) or int(time.time()), SCORING_VERSION)
+            if "cluster_keys" not in art:
+                art["cluster_keys"] = cluster_keys(art["title"], art["summary"])
+        except KeyError:
+            logging.exception("Skipping malformed article: %s", art.get("title"))
+            continue
+        batch.setdefault((art["title"], art["source"]), (art, row))
+    try:
+        with METRICS.timer("newsapp_db_query_seconds", query="save_articles"), write_transaction() as cur:
+            existing = find_existing_keys(cur, list(batch))
+            new = [entry for key, entry in batch.items() if key not in existing]
+            max_before = cur.execute("SELECT COALESCE(MAX(id), 0) FROM news_articles").fetchone()[0]
+            cur.executemany(INSERT_ARTICLE_SQL, [row for _, row in new])
+            # AUTOINCREMENT ids only grow and we hold the write lock, so everything
+            # above max_before was inserted by this statement, in order.
+            inserted = cur.execute("SELECT id, ts, region, category, source, sentiment, sentiment_score, confidence, "
+                                   "title, summary FROM news_articles WHERE id > ? ORDER BY id", (max_before,)).fetchall()
+            inserted_ids = [r[0] for r in inserted]
+            if inserted:
+                update_rollups(cur, [r[1:8] for r in inserted])
+                index_articles_for_search(cur, max_before)
+                assign_clusters(cur, [(r[0], r[1], r[8], r[9], batch[(r[8], r[4])][0]["cluster_keys"])
+                                      for r in inserted])
+                index_article_symbols(cur, [(r[0], r[1], article_symbols(batch[(r[8], r[4])][0])) for r in inserted])
+                bump_generation(cur)
+    except Exception:
+        logging.exception("Failed to save %d articles", len(batch))
+        raise
+    if len(inserted_ids) == len(new):
+        for (art, _), article_id in zip(new, inserted_ids):
+            art["id"] = article_id
+    if inserted_ids:
+        ARTICLE_EVENTS.notify()
+    METRICS.inc("newsapp_articles_inserted_total", len(inserted_ids))
+    METRICS.inc("newsapp_articles_ignored_total", len(articles) - len(inserted_ids))
+    logging.info("Saved %d new articles (%d already stored)", len(inserted_ids), len(articles) - len(inserted_ids))
+    return inserted_ids
+
+# Per-source results of the most recent fetch_all_news() run
+LAST_FETCH_STATS = {}
+
+def _fetch_source(name, conf, session):
+    # Each source gets its own wall-clock budget (conf "deadline", default
+    # SOURCE_DEADLINE) covering every attempt and the body download.
+    started = time.monotonic()
+    stats = {"source": name, "articles": 0, "deadline": started + conf.get("deadline", SOURCE_DEADLINE)}
+    if conf.get("type") == "rss":
+        articles = fetch_rss_news(name, conf, session=session, stats=stats)
+    elif conf.get("type") == "api":
+        articles = fetch_api_news(session=session, stats=stats)
+    else:
+        articles = []
+    elapsed = time.monotonic() - started
+    del stats["deadline"]
+    stats["elapsed"] = round(elapsed, 3)
+    stats["articles"] = len(articles)
+    for art in articles:
+        art["source_key"] = name
+    METRICS.observe("newsapp_fetch_seconds", elapsed, source=name)
+    METRICS.inc("newsapp_articles_parsed_total", len(articles), source=name)
+    if stats.get("not_modified"):
+        METRICS.inc("newsapp_fetch_not_modified_total", source=name)
+    if stats.get("error"):
+        METRICS.inc("newsapp_fetch_errors_total", source=name)
+    return articles, stats
+
+def _fetch_sources_sequential(sources, session):
+    all_articles, timings = [], {}
+    for name, conf in sources.items():
+        articles, stats = _fetch_source(name, conf, session)
+        all_articles.extend(articles)
+        timings[name] = stats
         if conf.get("type") == "rss":
-            all_articles.extend(fetch_rss_news(name, conf))
             time.sleep(0.5)
-    all_articles.extend(fetch_api_news(session=session))
+            METRICS.inc("newsapp_fetch_sleep_seconds_total", 0.5)
+    return all_articles, timings
+
+def _fetch_sources_concurrent(sources, session):
+    # Every source runs in its own worker and stops itself at its own deadline;
+    # FETCH_DEADLINE only backstops the whole cycle (e.g. sources queued behind a
+    # full pool), and anything still running then is reported as timed out.
+    all_articles, timings = [], {}
+    pool = ThreadPoolExecutor(max_workers=max(1, min(FETCH_MAX_WORKERS, len(sources))),
+                              thread_name_prefix="fetch")
+    futures = {pool.submit(_fetch_source, name, conf, session): name for name, conf in sources.items()}
+    try:
+        for fut in as_completed(futures, timeout=FETCH_DEADLINE):
+            name = futures[fut]
+            try:
+                articles, stats = fut.result()
+            except Exception as e:
+                logging.exception("Fetch worker failed for %s", name)
+                articles, stats = [], {"source": name, "articles": 0, "error": str(e)}
+            all_articles.extend(articles)
+            timings[name] = stats
+    except FuturesTimeoutError:
+        for fut, name in futures.items():
+            if name not in timings:
+                fut.cancel()
+                logging.error("Fetch for %s exceeded the %.1fs deadline", name, FETCH_DEADLINE)
+                timings[name] = {"source": name, "articles": 0, "elapsed": FETCH_DEADLINE,
+                                 "error": "deadline exceeded"}
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    return all_articles, timings
+
+def fetch_all_news(sources=None):
+    # sources: names from NEWS_SOURCES to fetch (default all); any over their daily
+    # request budget are left out.
+    profiler = SamplingProfiler(INGEST_PROFILE_INTERVAL).start() if INGEST_PROFILE_DIR else None
+    try:
+        return _run_fetch_cycle(sources)
+    finally:
+        if profiler:
+            profiler.stop()
+            path = os.path.join(INGEST_PROFILE_DIR, "ingest-%s.folded" % datetime.utcnow().strftime("%Y%m%dT%H%M%S"))
+            try:
+                os.makedirs(INGEST_PROFILE_DIR, exist_ok=True)
+                profiler.write(path)
+                logging.info("Ingest profile written to %s", path)
+            except OSError:
+                logging.exception("Could not write ingest profile")
+
+def _run_fetch_cycle(sources=None):
+    names = within_budget(sources if sources is not None else list(NEWS_SOURCES))
+    selected = {name: NEWS_SOURCES[name] for name in names if name in NEWS_SOURCES}
+    logging.info("Starting news fetch (%s)...", ", ".join(selected) or "no sources")
+    session = get_http_session()
+    started = time.monotonic()
+    if FETCH_CONCURRENT:
+        all_articles, timings = _fetch_sources_concurrent(selected, session)
+    else:
+        all_articles, timings = _fetch_sources_sequential(selected, session)
+    cycle = time.monotonic() - started
+    METRICS.observe("newsapp_fetch_cycle_seconds", cycle)
+    for name, stats in timings.items():
+        note = stats.get("error") or ("not modified" if stats.get("not_modified") else "")
+        logging.info("Source %s: %d articles in %.2fs%s", name, stats["articles"], stats.get("elapsed", 0.0),
+                     " (%s)" % note if note else "")
+    logging.info("Fetch cycle took %.2fs (sum of per-source times %.2fs)", cycle,
+                 sum(st.get("elapsed", 0.0) for st in timings.values()))
+    LAST_FETCH_STATS.clear()
+    LAST_FETCH_STATS.update({"cycle_seconds": round(cycle, 3), "sources": timings})
     if all_articles:
-        save_articles_to_db(all_articles)
+        LAST_FETCH_STATS["inserted"] = len(save_articles_to_db(all_articles))
     else:
-        logging.warning("No articles fetched")
+        logging.info("No new articles fetched")
+    for stats in timings.values():
+        stats["inserted"] = 0
+    for art in all_articles:
+        if art.get("id") and art.get("source_key") in timings:
+            timings[art["source_key"]]["inserted"] += 1
+    store_feed_validators(timings)
+    update_source_state(timings)
     return all_articles
 
-def get_articles_from_db(limit=50, region=None, category=None):
-    conn = sqlite3.connect(DB_PATH, timeout=30)
-    cur = conn.cursor()
-    query = "SELECT * FROM news_articles WHERE 1=1"
+# ----- adaptive polling -----
+# Every source keeps its own polling interval, learned from how many new articles its
+# fetches insert (an EWMA of articles/hour) so a fetch finds about POLL_TARGET_ARTICLES
+# new ones. Intervals stretch outside market hours, errors and 429s back off
+# exponentially, and sources with a daily_budget are paced to last the whole day.
+SOURCE_STATE_COLUMNS = ("source", "interval", "next_due", "rate", "error_streak", "budget_day",
+                        "requests_today", "last_fetch", "last_status")
+
+def _budget_day(now):
+    return datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+
+def in_market_hours(now=None):
+    zone = IST_ZONE or timezone(timedelta(hours=5, minutes=30))
+    local = datetime.fromtimestamp(now if now is not None else time.time(), zone)
+    opens, closes = MARKET_HOURS.split("-")
+    return local.weekday() < 5 and opens <= local.strftime("%H:%M") < closes
+
+def load_source_state():
+    rows = get_read_connection().execute("SELECT %s FROM source_state" % ", ".join(SOURCE_STATE_COLUMNS)).fetchall()
+    return {r[0]: dict(zip(SOURCE_STATE_COLUMNS, r)) for r in rows}
+
+def _requests_today(state, day):
+    return state["requests_today"] if state and state["budget_day"] == day else 0
+
+def within_budget(names, now=None):
+    now = now if now is not None else time.time()
+    day, state = _budget_day(now), load_source_state()
+    allowed = []
+    for name in names:
+        budget = NEWS_SOURCES.get(name, {}).get("daily_budget")
+        if budget and _requests_today(state.get(name), day) >= budget:
+            logging.warning("Skipping %s: daily budget of %d requests used", name, budget)
+            METRICS.inc("newsapp_fetch_budget_skips_total", source=name)
+            continue
+        allowed.append(name)
+    return allowed
+
+def due_sources(now=None):
+    now = now if now is not None else time.time()
+    state = load_source_state()
+    return within_budget([name for name in NEWS_SOURCES if name not in state or state[name]["next_due"] <= now], now)
+
+def next_poll_interval(conf, rate, requests_today, now):
+    if rate is None:
+        interval = POLL_DEFAULT_INTERVAL
+    elif rate <= 0:
+        interval = POLL_MAX_INTERVAL
+    else:
+        interval = POLL_TARGET_ARTICLES * 3600.0 / rate
+    if not in_market_hours(now):
+        interval *= POLL_OFF_HOURS_FACTOR
+    interval = min(POLL_MAX_INTERVAL, max(POLL_MIN_INTERVAL, interval))
+    budget = conf.get("daily_budget")
+    if budget:
+        # Spread what is left of today's budget over what is left of the (UTC) day
+        day_left = 86400 - now % 86400
+        remaining = budget - requests_today
+        interval = max(interval, day_left / remaining) if remaining > 0 else day_left
+    return interval
+
+def update_source_state(timings, now=None):
+    now = now if now is not None else time.time()
+    day, state = _budget_day(now), load_source_state()
+    rows = []
+    for name, stats in timings.items():
+        conf = NEWS_SOURCES.get(name, {})
+        prev = state.get(name) or {}
+        rate, streak = prev.get("rate"), prev.get("error_streak", 0)
+        # Retries are billed by the provider too, so count every HTTP attempt
+        requests_today = _requests_today(prev, day) + stats.get("attempts", 1)
+        if stats.get("error"):
+            streak += 1
+            interval = min(POLL_MAX_BACKOFF, POLL_MIN_INTERVAL * 2 ** streak)
+            interval = max(interval, stats.get("retry_after") or 0)
+        else:
+            streak = 0
+            if prev.get("last_fetch"):
+                # The first fetch after a restart sees the whole backlog, so it only
+                # seeds last_fetch; later ones feed the rate estimate.
+                observed = stats.get("inserted", 0) * 3600.0 / max(now - prev["last_fetch"], POLL_MIN_INTERVAL)
+                if stats.get("articles") and stats.get("inserted", 0) >= stats["articles"]:
+                    # Every item served was new, so the feed may have outrun us
+                    observed *= 2
+                rate = observed if rate is None else POLL_EWMA_ALPHA * observed + (1 - POLL_EWMA_ALPHA) * rate
+            interval = next_poll_interval(conf, rate, requests_today, now)
+        status = stats.get("error") or ("not modified" if stats.get("not_modified") else "ok")
+        rows.append((name, interval, now + interval, rate, streak, day, requests_today,
+                     prev.get("last_fetch") if stats.get("error") else now, status))
+    if not rows:
+        return
+    with write_transaction() as cur:
+        cur.executemany("INSERT OR REPLACE INTO source_state (%s) VALUES (%s)"
+                        % (", ".join(SOURCE_STATE_COLUMNS), ", ".join("?" * len(SOURCE_STATE_COLUMNS))), rows)
+
+ARTICLE_COLUMNS = ('id', 'title', 'summary', 'source', 'category', 'region', 'sentiment',
+                   'sentiment_score', 'confidence', 'market_impact', 'impact_score',
+                   'timestamp', 'url', 'content', 'ts', 'cluster_id', 'scoring_version')
+
+def select_columns(columns, table=None):
+    prefix = table + "." if table else ""
+    return ", ".join("COALESCE(%scontent, %ssummary)" % (prefix, prefix) if c == "content" else prefix + c
+                     for c in columns)
+
+def make_cursor(article):
+    return "%d_%d" % (article["ts"], article["id"])
+
+def parse_cursor(cursor):
+    ts, article_id = cursor.split("_", 1)
+    return int(ts), int(article_id)
+
+def get_articles_from_db(limit=50, region=None, category=None, before=None, dedupe=False):
+    # Newest first on (ts, id); "before" is a cursor from make_cursor() and seeks
+    # straight to the next page through the (region|category, ts) indexes. dedupe
+    # keeps only each near-duplicate cluster's representative.
+    cur = get_read_connection().cursor()
+    query = "SELECT %s FROM news_articles WHERE 1=1" % select_columns(ARTICLE_COLUMNS)
     params = []
     if region and region != "all":
         query += " AND region = ?"
@@ -284,15 +1862,473 @@ def get_articles_from_db(limit=50, region=None, category=None):
     if category and category != "all":
         query += " AND category = ?"
         params.append(category)
-    query += " ORDER BY timestamp DESC LIMIT ?"
+    if dedupe:
+        query += " AND cluster_id = id"
+    if before:
+        query += " AND (ts, id) < (?, ?)"
+        params.extend(parse_cursor(before))
+    query += " ORDER BY ts DESC, id DESC LIMIT ?"
     params.append(limit)
-    cur.execute(query, params)
-    rows = cur.fetchall()
-    conn.close()
-    cols = ['id', 'title', 'summary', 'source', 'category', 'region', 'sentiment',
-            'sentiment_score', 'confidence', 'market_impact', 'impact_score',
-            'timestamp', 'url', 'content']
-    return [dict(zip(cols, r)) for r in rows]
+    with METRICS.timer("newsapp_db_query_seconds", query="get_articles"):
+        rows = cur.execute(query, params).fetchall()
+    return [dict(zip(ARTICLE_COLUMNS, r)) for r in rows]
+
+def get_articles_after(after_id, limit=20, dedupe=False):
+    # Newest rows inserted after after_id, walked on the rowid so it only touches new rows
+    query = "SELECT %s FROM news_articles WHERE id > ?" % select_columns(ARTICLE_COLUMNS)
+    if dedupe:
+        query += " AND cluster_id = id"
+    query += " ORDER BY id DESC LIMIT ?"
+    with METRICS.timer("newsapp_db_query_seconds", query="get_articles_after"):
+        rows = get_read_connection().execute(query, (after_id, limit)).fetchall()
+    return [dict(zip(ARTICLE_COLUMNS, r)) for r in rows]
+
+def get_max_article_id():
+    return get_read_connection().execute("SELECT COALESCE(MAX(id), 0) FROM news_articles").fetchone()[0]
+
+# ----- streaming export -----
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def iter_export(fields, fmt="ndjson", start=None, end=None, region=None, category=None, compress=False):
+    # Rows are pulled from the cursor EXPORT_BATCH_ROWS at a time and encoded as they
+    # arrive, so memory stays flat however many rows match. The generator owns its
+    # own connection because it outlives the request handler.
+    where, params = ["1=1"], []
+    if start is not None:
+        where.append("ts >= ?")
+        params.append(start)
+    if end is not None:
+        where.append("ts < ?")
+        params.append(end)
+    for column, value in (("region", region), ("category", category)):
+        if value and value != "all":
+            where.append("%s = ?" % column)
+            params.append(value)
+    query = "SELECT %s FROM news_articles WHERE %s ORDER BY ts, id" % (select_columns(fields), " AND ".join(where))
+    gz = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+
+    def emit(text):
+        data = text.encode("utf-8")
+        return gz.compress(data) + gz.flush(zlib.Z_SYNC_FLUSH) if gz else data
+
+    conn = _connect(readonly=True)
+    try:
+        cur = conn.execute(query, params)
+        if fmt == "csv":
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(fields)
+            yield emit(buf.getvalue())
+        while True:
+            rows = cur.fetchmany(EXPORT_BATCH_ROWS)
+            if not rows:
+                break
+            if fmt == "csv":
+                buf.seek(0)
+                buf.truncate()
+                writer.writerows(rows)
+                yield emit(buf.getvalue())
+            else:
+                yield emit("".join(json.dumps(dict(zip(fields, r)), ensure_ascii=False) + "\n" for r in rows))
+        if gz:
+            yield gz.flush()
+    finally:
+        conn.close()
+
+# ----- retention & archive -----
+# Rows older than RETENTION_DAYS move, oldest first and ARCHIVE_BATCH_ROWS per
+# transaction, to gzip NDJSON files partitioned by month (ARCHIVE_DIR/articles-YYYY-MM.ndjson.gz,
+# one gzip member appended per batch) that /api/archive can still query. Hourly
+# rollups are kept, so /api/stats still covers archived periods.
+def archive_path(month):
+    return os.path.join(ARCHIVE_DIR, "articles-%s.ndjson.gz" % month)
+
+def _archive_month(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m")
+
+def write_archive(month, articles):
+    gz = zlib.compressobj(9, zlib.DEFLATED, 31)
+    data = gz.compress("".join(json.dumps(a, ensure_ascii=False) + "\n" for a in articles).encode("utf-8"))
+    with open(archive_path(month), "ab") as fh:
+        fh.write(data + gz.flush())
+        fh.flush()
+        os.fsync(fh.fileno())
+
+def delete_articles(cur, ids, ts_range=None):
+    # Removes articles together with their search-index entries and LSH bands. Cluster
+    # members left without their representative get the oldest remaining member.
+    for i in range(0, len(ids), KEY_LOOKUP_CHUNK):
+        chunk = ids[i:i + KEY_LOOKUP_CHUNK]
+        marks = ",".join("?" * len(chunk))
+        if has_search_index(cur):
+            # External-content FTS deletes need the values that were indexed
+            cur.execute("INSERT INTO news_fts (news_fts, rowid, title, summary, content) "
+                        "SELECT 'delete', id, title, summary, content FROM news_articles WHERE id IN (%s)" % marks, chunk)
+        cur.execute("DELETE FROM minhash_bands WHERE article_id IN (%s)" % marks, chunk)
+        cur.execute("DELETE FROM article_symbols WHERE article_id IN (%s)" % marks, chunk)
+        cur.execute("DELETE FROM news_articles WHERE id IN (%s)" % marks, chunk)
+        # ts_range bounds the deleted rows; members join a cluster within
+        # CLUSTER_WINDOW_HOURS of it, so orphans can only sit a little past its end
+        sql = "SELECT id, cluster_id FROM news_articles WHERE cluster_id IN (%s)" % marks
+        params = list(chunk)
+        if ts_range is not None:
+            sql += " AND ts >= ? AND ts < ?"
+            params += [ts_range[0], ts_range[1] + 2 * CLUSTER_WINDOW_HOURS * 3600]
+        representatives = {}
+        for article_id, cluster_id in cur.execute(sql, params).fetchall():
+            representatives[cluster_id] = min(article_id, representatives.get(cluster_id, article_id))
+        cur.executemany("UPDATE news_articles SET cluster_id = ? WHERE cluster_id = ?",
+                        [(new, old) for old, new in representatives.items()])
+
+def archive_old_articles(retention_days=None, batch_size=None, now=None):
+    retention_days = RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or ARCHIVE_BATCH_ROWS
+    if retention_days <= 0:
+        return 0
+    cutoff = int(now if now is not None else time.time()) - retention_days * 86400
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    ts_index = ARTICLE_COLUMNS.index("ts")
+    moved = 0
+    while True:
+        with METRICS.timer("newsapp_db_query_seconds", query="archive"), write_transaction() as cur:
+            rows = cur.execute("SELECT %s FROM news_articles WHERE ts < ? ORDER BY ts, id LIMIT ?"
+                               % select_columns(ARTICLE_COLUMNS), (cutoff, batch_size)).fetchall()
+            if not rows:
+                break
+            partitions = {}
+            for r in rows:
+                partitions.setdefault(_archive_month(r[ts_index]), []).append(dict(zip(ARTICLE_COLUMNS, r)))
+            # Written before the delete commits: a crash in between leaves a duplicate
+            # in the archive (query_archive skips it), never a lost row.
+            for month, articles in partitions.items():
+                write_archive(month, articles)
+            delete_articles(cur, [r[0] for r in rows], ts_range=(rows[0][ts_index], rows[-1][ts_index]))
+            bump_generation(cur)
+        moved += len(rows)
+        METRICS.inc("newsapp_articles_archived_total", len(rows))
+    if moved:
+        incremental_vacuum()
+        logging.info("Archived %d articles older than %d days to %s", moved, retention_days, ARCHIVE_DIR)
+    return moved
+
+def query_archive(start=None, end=None, region=None, category=None, source=None, limit=100):
+    # Newest first. Partitions are scanned newest month first and outside [start, end)
+    # skipped by name, so a recent window only decompresses a file or two.
+    first = _archive_month(start) if start is not None else None
+    last = _archive_month(end - 1) if end is not None else None
+    paths = sorted(glob.glob(os.path.join(ARCHIVE_DIR, "articles-*.ndjson.gz")), reverse=True)
+    results, seen = [], set()
+    for path in paths:
+        month = os.path.basename(path)[len("articles-"):-len(".ndjson.gz")]
+        if (first and month < first) or (last and month > last):
+            continue
+        if len(results) >= limit:
+            break
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                article = json.loads(line)
+                if article["id"] in seen:
+                    continue
+                if (start is not None and article["ts"] < start) or (end is not None and article["ts"] >= end):
+                    continue
+                if any(value and value != "all" and article.get(column) != value
+                       for column, value in (("region", region), ("category", category), ("source", source))):
+                    continue
+                seen.add(article["id"])
+                results.append(article)
+    results.sort(key=lambda a: (a["ts"], a["id"]), reverse=True)
+    return results[:limit]
+
+def _median_ms(fn, runs=5):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return round(1000 * statistics.median(timings), 3)
+
+def storage_report():
+    cur = get_read_connection()
+    page_size = cur.execute("PRAGMA page_size").fetchone()[0]
+    since = int(time.time()) - 86400
+    queries = {
+        "latest_page": lambda: get_articles_from_db(limit=50),
+        "latest_page_deduped": lambda: get_articles_from_db(limit=50, dedupe=True),
+        "stats_24h": lambda: query_rollups(start=since),
+        "full_scan": lambda: cur.execute("SELECT COUNT(*), SUM(LENGTH(summary) + LENGTH(COALESCE(content, ''))) "
+                                         "FROM news_articles").fetchone(),
+    }
+    if has_search_index(cur):
+        queries["search"] = lambda: search_articles("market", limit=20)
+    return {
+        "rows": cur.execute("SELECT COUNT(*) FROM news_articles").fetchone()[0],
+        "db_bytes": sum(os.path.getsize(DB_PATH + suffix) for suffix in ("", "-wal") if os.path.exists(DB_PATH + suffix)),
+        "pages": cur.execute("PRAGMA page_count").fetchone()[0],
+        "free_pages": cur.execute("PRAGMA freelist_count").fetchone()[0],
+        "page_size": page_size,
+        "archive_bytes": sum(os.path.getsize(p) for p in glob.glob(os.path.join(ARCHIVE_DIR, "articles-*.ndjson.gz"))),
+        "query_ms": {name: _median_ms(fn) for name, fn in queries.items()},
+    }
+
+def compact_database(retention_days=None):
+    # Archive, then give the freed pages back to the filesystem. The first run on a
+    # database created before auto_vacuum=INCREMENTAL needs one full VACUUM.
+    before = storage_report()
+    archived = archive_old_articles(retention_days)
+    if run_maintenance("PRAGMA auto_vacuum")[0][0] != 2:
+        run_maintenance("PRAGMA auto_vacuum=INCREMENTAL")
+        run_maintenance("VACUUM")
+    else:
+        incremental_vacuum()
+    run_maintenance("PRAGMA optimize")
+    run_maintenance("PRAGMA wal_checkpoint(TRUNCATE)")
+    return {"archived": archived, "before": before, "after": storage_report()}
+
+def run_retention():
+    try:
+        archive_old_articles()
+    except Exception:
+        logging.exception("Retention run failed")
+
+# ----- re-scoring -----
+# Brings rows scored by an older SCORING_VERSION up to date without re-fetching.
+# The main process pages through pending rows by id and scores chunks on a process
+# pool (a few chunks in flight per worker, so memory stays flat). Each chunk's
+# results are written in one transaction that moves its rollup counts and stamps
+# scoring_version, so an interrupted run resumes where it stopped. Archived rows
+# are not touched.
+RESCORE_FIELDS = ("sentiment", "sentiment_score", "confidence", "market_impact", "impact_score", "category")
+RESCORE_COLUMNS = "id, ts, region, source, " + ", ".join(RESCORE_FIELDS)
+
+def _rescore_deltas(rows, scored):
+    # rows: RESCORE_COLUMNS tuples, scored: their new RESCORE_FIELDS. Rollup deltas
+    # that move the rows from their current scores to the new ones.
+    deltas = rollup_deltas([(r[1], r[2], r[9], r[3]) + tuple(r[4:7]) for r in rows], sign=-1)
+    return rollup_deltas([(r[1], r[2], new[5], r[3]) + new[:3] for r, new in zip(rows, scored)], deltas=deltas)
+
+def _rescore_range(lo, hi, version, rss_labels):
+    # Pool worker: reads the pending rows with lo < id <= hi on its own read-only
+    # connection and scores them. Returns (highest id read, rows read, changed rows as
+    # (RESCORE_COLUMNS values read, new fields), rollup deltas for the changed rows).
+    rows = get_read_connection().execute(
+        "SELECT %s, title, COALESCE(content, summary) FROM news_articles "
+        "WHERE id > ? AND id <= ? AND COALESCE(scoring_version, 0) < ? ORDER BY id"
+        % RESCORE_COLUMNS, (lo, hi, version)).fetchall()
+    if not rows:
+        return hi, 0, [], {}
+    scored = score_articles([(r[10], r[11] or "", r[3] in rss_labels) for r in rows])
+    changed = []
+    for r, fields in zip(rows, scored):
+        new = tuple(fields[f] for f in RESCORE_FIELDS)
+        if tuple(r[4:10]) != new:
+            changed.append((tuple(r[:10]), new))
+    return (rows[-1][0], len(rows), changed,
+            _rescore_deltas([r for r, _ in changed], [new for _, new in changed]))
+
+def _iter_rescore_ranges(version, chunk_size):
+    # Consecutive ranges of chunk_size ids covering the pending rows
+    lo, hi = get_read_connection().execute(
+        "SELECT MIN(id) - 1, MAX(id) FROM news_articles WHERE COALESCE(scoring_version, 0) < ?", (version,)).fetchone()
+    while lo is not None and lo < hi:
+        yield lo, min(lo + chunk_size, hi)
+        lo += chunk_size
+
+def apply_rescored(lo, result, version):
+    # Writes one worker result: applies its rollup deltas, updates the changed rows and
+    # stamps the rest of its range. Returns (rows stamped, rows whose scores changed).
+    # Changed rows are re-read under the write lock; if any was edited, removed or
+    # re-scored since the worker read it, the deltas are recomputed from current values.
+    last_id, read, changed, deltas = result
+    if not read:
+        return 0, 0
+    with write_transaction() as cur:
+        if changed:
+            ids = [row[0] for row, _ in changed]
+            current = []
+            for i in range(0, len(ids), KEY_LOOKUP_CHUNK):
+                chunk = ids[i:i + KEY_LOOKUP_CHUNK]
+                current += cur.execute(
+                    "SELECT %s FROM news_articles WHERE id IN (%s) AND COALESCE(scoring_version, 0) < ? ORDER BY id"
+                    % (RESCORE_COLUMNS, ",".join("?" * len(chunk))), chunk + [version]).fetchall()
+            if [tuple(r) for r in current] != [row for row, _ in changed]:
+                new = {row[0]: fields for row, fields in changed}
+                changed = [(r, new[r[0]]) for r in current]
+                deltas = _rescore_deltas(current, [fields for _, fields in changed])
+            apply_rollup_deltas(cur, deltas)
+            cur.executemany("UPDATE news_articles SET sentiment = ?, sentiment_score = ?, confidence = ?, "
+                            "market_impact = ?, impact_score = ?, category = ?, scoring_version = ? WHERE id = ?",
+                            [fields + (version, row[0]) for row, fields in changed])
+            if changed:
+                bump_generation(cur)
+        cur.execute("UPDATE news_articles SET scoring_version = ? WHERE id > ? AND id <= ? "
+                    "AND COALESCE(scoring_version, 0) < ?", (version, lo, last_id, version))
+        stamped = cur.rowcount + len(changed)
+    return stamped, len(changed)
+
+def rescore_articles(workers=None, chunk_size=2000, version=None, progress_every=5.0):
+    version = SCORING_VERSION if version is None else version
+    workers = max(1, workers or os.cpu_count() or 1)
+    total = get_read_connection().execute(
+        "SELECT COUNT(*) FROM news_articles WHERE COALESCE(scoring_version, 0) < ?", (version,)).fetchone()[0]
+    logging.info("Re-scoring %d articles to scoring version %d on %d workers", total, version, workers)
+    done = changed = 0
+    started = last_report = time.monotonic()
+
+    def apply(lo, result):
+        nonlocal done, changed, last_report
+        stamped, moved = apply_rescored(lo, result, version)
+        done += stamped
+        changed += moved
+        METRICS.inc("newsapp_articles_rescored_total", stamped)
+        now = time.monotonic()
+        if now - last_report >= progress_every:
+            rate = done / (now - started)
+            logging.info("Re-scored %d/%d (%.1f%%) at %.0f rows/s, %d changed, ETA %.0fs", done, total,
+                         100.0 * done / max(total, 1), rate, changed, (total - done) / rate if rate else 0)
+            last_report = now
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    rss_labels = {rss_source_label(name) for name, conf in NEWS_SOURCES.items() if conf.get("type") == "rss"}
+    pending = deque()
+    with context.Pool(workers) as pool:
+        for lo, hi in _iter_rescore_ranges(version, chunk_size):
+            pending.append((lo, pool.apply_async(_rescore_range, (lo, hi, version, rss_labels))))
+            if len(pending) >= 2 * workers:
+                lo, result = pending.popleft()
+                apply(lo, result.get())
+        while pending:
+            lo, result = pending.popleft()
+            apply(lo, result.get())
+    elapsed = time.monotonic() - started
+    summary = {"version": version, "workers": workers, "pending": total, "rescored": done, "changed": changed,
+               "seconds": round(elapsed, 3), "rows_per_sec": round(done / elapsed) if elapsed else None}
+    logging.info("Re-scoring finished: %s", summary)
+    return summary
+
+# ----- change notification -----
+# Wakes /stream generators in this process as soon as an ingest commits. Streams in
+# other processes (gunicorn workers, the ingest worker) notice through the data
+# generation instead, checked every STREAM_POLL_SECONDS.
+class ChangeNotifier:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.version = 0
+
+    def notify(self):
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+
+    def wait(self, seen, timeout):
+        with self._cond:
+            self._cond.wait_for(lambda: self.version != seen, timeout)
+            return self.version
+
+ARTICLE_EVENTS = ChangeNotifier()
+
+# ----- background fetch jobs -----
+# Fetches run on a background thread of the process that takes the "fetch" lease.
+# Job records live in fetch_jobs so any process can report them, and the lease
+# names the running job: a trigger that arrives while one is in flight, in any
+# process, joins it instead of starting another.
+FETCH_JOB_COLUMNS = ("id", "trigger", "status", "started_at", "finished_at", "articles", "inserted", "sources",
+                     "error", "joined", "requested")
+
+def _now_iso():
+    return datetime.now(IST_ZONE).isoformat() if IST_ZONE else datetime.utcnow().isoformat()
+
+def _load_fetch_job(conn, job_id):
+    row = conn.execute("SELECT %s FROM fetch_jobs WHERE id = ?" % ", ".join(FETCH_JOB_COLUMNS), (job_id,)).fetchone()
+    if row is None:
+        return None
+    job = dict(zip(FETCH_JOB_COLUMNS, row))
+    for key in ("sources", "requested"):
+        job[key] = json.loads(job[key]) if job[key] is not None else None
+    return job
+
+def current_fetch_job():
+    conn = get_read_connection()
+    row = conn.execute("SELECT job_id FROM leases WHERE name = 'fetch' AND expires_at > ?", (time.time(),)).fetchone()
+    return _load_fetch_job(conn, row[0]) if row and row[0] else None
+
+def get_fetch_job(job_id):
+    return _load_fetch_job(get_read_connection(), job_id)
+
+def submit_fetch_job(trigger="manual", sources=None):
+    # Returns (job, started): started is False when the caller joined a running job.
+    # sources limits the run to those NEWS_SOURCES names (default: all of them).
+    now = time.time()
+    with write_transaction() as cur:
+        row = cur.execute("SELECT expires_at, job_id FROM leases WHERE name = 'fetch'").fetchone()
+        if row and row[0] > now and row[1]:
+            cur.execute("UPDATE fetch_jobs SET joined = joined + 1 WHERE id = ?", (row[1],))
+            job = _load_fetch_job(cur, row[1])
+            if job is not None:
+                return job, False
+        if row and row[1]:
+            # Its holder died mid-run; the lease expired without the job finishing
+            cur.execute("UPDATE fetch_jobs SET status = 'failed', error = 'abandoned', finished_at = ? "
+                        "WHERE id = ? AND status = 'running'", (_now_iso(), row[1]))
+        job = {"id": uuid.uuid4().hex, "trigger": trigger, "status": "running", "started_at": _now_iso(),
+               "finished_at": None, "articles": None, "inserted": None, "sources": None, "error": None,
+               "joined": 0, "requested": list(sources) if sources is not None else None}
+        cur.execute("INSERT INTO leases (name, holder, acquired_at, expires_at, job_id) VALUES ('fetch', ?, ?, ?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, acquired_at = excluded.acquired_at, "
+                    "expires_at = excluded.expires_at, job_id = excluded.job_id",
+                    (PROCESS_ID, now, now + LEASE_TTL, job["id"]))
+        cur.execute("INSERT INTO fetch_jobs (id, trigger, status, started_at, joined, requested, holder) "
+                    "VALUES (?, ?, ?, ?, 0, ?, ?)", (job["id"], trigger, job["status"], job["started_at"],
+                                                     json.dumps(job["requested"]), PROCESS_ID))
+        cur.execute("DELETE FROM fetch_jobs WHERE rowid <= (SELECT MAX(rowid) FROM fetch_jobs) - ?",
+                    (FETCH_JOB_HISTORY,))
+    threading.Thread(target=_run_fetch_job, args=(job,), name="fetch-job-%s" % job["id"][:8], daemon=True).start()
+    return job, True
+
+def _run_fetch_job(job):
+    # The "fetch" lease was taken for this job by submit_fetch_job and is renewed
+    # until the job finishes, however long the sources take
+    finished = threading.Event()
+    threading.Thread(target=_renew_fetch_lease, args=(job["id"], finished),
+                     name="fetch-lease-%s" % job["id"][:8], daemon=True).start()
+    try:
+        articles = fetch_all_news(job["requested"])
+        result = {"status": "succeeded", "articles": len(articles), "inserted": LAST_FETCH_STATS.get("inserted", 0),
+                  "sources": LAST_FETCH_STATS.get("sources", {}), "error": None}
+    except Exception as e:
+        logging.exception("Fetch job %s failed", job["id"])
+        result = {"status": "failed", "articles": None, "inserted": None, "sources": None, "error": str(e)}
+    finally:
+        finished.set()
+    with write_transaction() as cur:
+        cur.execute("UPDATE fetch_jobs SET status = ?, finished_at = ?, articles = ?, inserted = ?, sources = ?, "
+                    "error = ? WHERE id = ?",
+                    (result["status"], _now_iso(), result["articles"], result["inserted"],
+                     json.dumps(result["sources"]) if result["sources"] is not None else None, result["error"],
+                     job["id"]))
+        cur.execute("DELETE FROM leases WHERE name = 'fetch' AND job_id = ?", (job["id"],))
+
+def _renew_fetch_lease(job_id, finished):
+    while not finished.wait(LEASE_TTL / 3):
+        try:
+            with write_transaction() as cur:
+                cur.execute("UPDATE leases SET expires_at = ? WHERE name = 'fetch' AND job_id = ?",
+                            (time.time() + LEASE_TTL, job_id))
+        except Exception:
+            logging.exception("Fetch lease renewal failed")
+
+def scheduled_fetch():
+    job, started = submit_fetch_job("scheduled")
+    if not started:
+        logging.info("Scheduled fetch joined running job %s", job["id"])
+
+def scheduled_tick():
+    # Adaptive mode: runs every POLL_TICK_SECONDS and fetches only the sources that are due
+    if current_fetch_job():
+        return
+    due = due_sources()
+    if due:
+        submit_fetch_job("scheduled", sources=due)
 
 # ----- HTML template (unchanged from your original; full template) -----
 HTML_TEMPLATE = '''
@@ -317,7 +2353,7 @@ HTML_TEMPLATE = '''
 </head>
 <body class="bg-light">
     <div class="auto-refresh">
-        <i class="fas fa-sync-alt"></i> Auto-updates every 30min
+        <i class="fas fa-sync-alt"></i> <span id="live-status">Live updates</span>
     </div>
     
     <div class="container-fluid py-4">
@@ -327,7 +2363,7 @@ HTML_TEMPLATE = '''
                     <i class="fas fa-chart-line me-3"></i>AI Financial News Analyzer
                 </h1>
                 <p class="lead text-muted">Real-time sentiment analysis of Indian & global financial markets</p>
-                <small class="text-muted">Last updated: {{ last_updated }} IST | Total articles: {{ total_articles }}</small>
+                <small class="text-muted">Last updated: <span id="last-updated">{{ last_updated }}</span> IST | Total articles ({{ stats_period }}): <span id="total-articles">{{ total_articles }}</span></small>
             </div>
         </div>
         
@@ -335,32 +2371,32 @@ HTML_TEMPLATE = '''
             <div class="col-md-3">
                 <div class="card bg-primary text-white">
                     <div class="card-body text-center">
-                        <h3>{{ total_articles }}</h3>
-                        <p class="mb-0">Live Articles</p>
+                        <h3 id="counter-total">{{ total_articles }}</h3>
+                        <p class="mb-0">Articles <small>({{ stats_period }})</small></p>
                     </div>
                 </div>
             </div>
             <div class="col-md-3">
                 <div class="card bg-success text-white">
                     <div class="card-body text-center">
-                        <h3>{{ positive_news }}</h3>
-                        <p class="mb-0">Positive News</p>
+                        <h3 id="counter-positive">{{ positive_news }}</h3>
+                        <p class="mb-0">Positive News <small>({{ stats_period }})</small></p>
                     </div>
                 </div>
             </div>
             <div class="col-md-3">
                 <div class="card bg-danger text-white">
                     <div class="card-body text-center">
-                        <h3>{{ negative_news }}</h3>
-                        <p class="mb-0">Negative News</p>
+                        <h3 id="counter-negative">{{ negative_news }}</h3>
+                        <p class="mb-0">Negative News <small>({{ stats_period }})</small></p>
                     </div>
                 </div>
             </div>
             <div class="col-md-3">
                 <div class="card bg-info text-white">
                     <div class="card-body text-center">
-                        <h3>{{ avg_confidence }}%</h3>
-                        <p class="mb-0">Avg Confidence</p>
+                        <h3 id="counter-confidence">{{ avg_confidence }}%</h3>
+                        <p class="mb-0">Avg Confidence <small>({{ stats_period }})</small></p>
                     </div>
                 </div>
             </div>
@@ -373,6 +2409,10 @@ HTML_TEMPLATE = '''
                         <h5><i class="fas fa-newspaper me-2"></i>Latest Financial News & AI Analysis</h5>
                     </div>
                     <div class="card-body">
+                        {% if fetching %}
+                        <p id="fetching-notice" class="text-muted mb-0"><i class="fas fa-spinner fa-spin me-2"></i>Fetching the latest news, it will appear here shortly.</p>
+                        {% endif %}
+                        <div id="news-list" data-last-id="{{ last_id }}">
                         {% for article in articles %}
                         <div class="news-item">
                             <div class="row">
@@ -398,6 +2438,7 @@ HTML_TEMPLATE = '''
                             </div>
                         </div>
                         {% endfor %}
+                        </div>
                     </div>
                 </div>
             </div>
@@ -405,68 +2446,645 @@ HTML_TEMPLATE = '''
     </div>
     
     <script>
-        // Auto-refresh every 30 minutes
-        setTimeout(() => location.reload(), 1800000);
+        // New articles and counters are pushed over /stream and patched into the page
+        (function () {
+            const list = document.getElementById('news-list');
+            const status = document.getElementById('live-status');
+            let since = list.dataset.lastId;
+
+            function el(tag, className, text) {
+                const node = document.createElement(tag);
+                if (className) node.className = className;
+                if (text !== undefined) node.textContent = text;
+                return node;
+            }
+
+            function render(a) {
+                const item = el('div', 'news-item');
+                const row = item.appendChild(el('div', 'row'));
+                const main = row.appendChild(el('div', 'col-md-8'));
+                main.appendChild(el('h6', 'fw-bold mb-2', a.title));
+                main.appendChild(el('p', 'mb-2', a.summary));
+                const badges = main.appendChild(el('div', 'mb-2'));
+                badges.appendChild(el('span', 'badge bg-secondary', a.source));
+                badges.append(' ');
+                badges.appendChild(el('span', 'badge bg-info', a.region));
+                badges.append(' ');
+                badges.appendChild(el('span', 'badge bg-warning', a.category));
+                badges.append(' ');
+                badges.appendChild(el('span', 'sentiment-' + a.sentiment.toLowerCase(), a.sentiment));
+                const side = row.appendChild(el('div', 'col-md-4 text-end'));
+                side.appendChild(el('div', 'impact-' + a.market_impact.toLowerCase() + ' mb-2',
+                                    'Impact: ' + a.impact_score + '/10'));
+                const conf = side.appendChild(el('div', 'mb-2'));
+                conf.appendChild(el('strong', null, 'AI Confidence:'));
+                conf.append(' ' + a.confidence + '%');
+                side.appendChild(el('small', 'text-muted', a.timestamp));
+                return item;
+            }
+
+            function applyCounters(c) {
+                document.getElementById('counter-total').textContent = c.total_articles;
+                document.getElementById('total-articles').textContent = c.total_articles;
+                document.getElementById('counter-positive').textContent = c.positive_news;
+                document.getElementById('counter-negative').textContent = c.negative_news;
+                document.getElementById('counter-confidence').textContent = c.avg_confidence + '%';
+                document.getElementById('last-updated').textContent = c.last_updated;
+            }
+
+            // Fallback while the server refuses streams: revalidate /api/dashboard every
+            // 30s, which costs a 304 when nothing changed
+            let pollTimer = null, etag = null, polls = 0;
+
+            function poll() {
+                fetch('/api/dashboard', {headers: etag ? {'If-None-Match': etag} : {}, cache: 'no-store'})
+                    .then((resp) => {
+                        if (!resp.ok) return null;
+                        etag = resp.headers.get('ETag');
+                        return resp.json();
+                    })
+                    .then((data) => {
+                        if (!data) return;
+                        since = data.last_id;
+                        list.replaceChildren(...data.articles.map(render));
+                        applyCounters(data.counters);
+                        const notice = document.getElementById('fetching-notice');
+                        if (notice && data.articles.length) notice.remove();
+                    })
+                    .catch(() => {});
+            }
+
+            function startPolling() {
+                status.textContent = 'Updating every 30s';
+                if (pollTimer) return;
+                poll();
+                pollTimer = setInterval(() => {
+                    poll();
+                    // Streams free up as other dashboards close
+                    if (window.EventSource && ++polls % 10 === 0) connect();
+                }, 30000);
+            }
+
+            function stopPolling() {
+                clearInterval(pollTimer);
+                pollTimer = null;
+            }
+
+            function connect() {
+                const source = new EventSource('/stream?since=' + encodeURIComponent(since));
+                source.onopen = () => {
+                    stopPolling();
+                    status.textContent = 'Live updates';
+                };
+                source.addEventListener('articles', (e) => {
+                    const data = JSON.parse(e.data);
+                    since = data.last_id;
+                    data.articles.slice().reverse().forEach((a) => list.insertBefore(render(a), list.firstChild));
+                    while (list.children.length > 20) list.removeChild(list.lastChild);
+                    const notice = document.getElementById('fetching-notice');
+                    if (notice && data.articles.length) notice.remove();
+                });
+                source.addEventListener('counters', (e) => applyCounters(JSON.parse(e.data)));
+                source.onerror = () => {
+                    // The browser retries by itself unless the server refused the stream
+                    if (source.readyState === EventSource.CLOSED) {
+                        startPolling();
+                    } else if (!pollTimer) {
+                        status.textContent = 'Reconnecting...';
+                    }
+                };
+            }
+
+            if (window.EventSource) {
+                connect();
+            } else {
+                startPolling();
+            }
+        })();
     </script>
 </body>
 </html>
 '''
 
+# ----- Response cache -----
+class ResponseCache:
+    # LRU of rendered response bodies bounded by entry count and total bytes. An entry
+    # is only served while the data generation it was rendered from is current.
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, generation):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["generation"] != generation:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry):
+        size = len(entry["body"])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        self._bytes -= len(self._entries.pop(key)["body"])
+
+RESPONSE_CACHE = ResponseCache(RESPONSE_CACHE_ENTRIES, RESPONSE_CACHE_BYTES)
+
+def cached_response(view=None, period=None):
+    # Caches successful responses per (path, query args) for the current data generation
+    # and serves them with a strong ETag, so revalidating clients get a 304.
+    # Views that read the clock pass period (seconds, or a callable returning seconds
+    # or None for this request); their entries also expire when that window rolls over.
+    if view is None:
+        return functools.partial(cached_response, period=period)
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        generation = get_generation()
+        window = period() if callable(period) else period
+        if window:
+            generation = (generation, int(time.time() // window))
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        entry = RESPONSE_CACHE.get(key, generation)
+        if entry is None:
+            resp = app.make_response(view(*args, **kwargs))
+            if resp.status_code != 200 or resp.is_streamed or "no-store" in resp.headers.get("Cache-Control", ""):
+                return resp
+            body = resp.get_data()
+            headers = [(k, v) for k, v in resp.headers.items() if k.lower() not in ("content-length", "etag")]
+            entry = {"generation": generation, "body": body, "headers": headers,
+                     "etag": hashlib.sha256(body).hexdigest()[:32]}
+            RESPONSE_CACHE.put(key, entry)
+        resp = app.response_class(entry["body"], headers=entry["headers"])
+        resp.set_etag(entry["etag"])
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp.make_conditional(request)
+    return wrapper
+
 # ----- Routes -----
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def _record_request_metrics(resp):
+    started = getattr(g, "request_started", None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        METRICS.observe("newsapp_http_request_seconds", time.perf_counter() - started,
+                        route=route, method=request.method, status=resp.status_code)
+    return resp
+
+def dashboard_counters():
+    # Figures over the last DASHBOARD_STATS_HOURS (all articles when <= 0); stats_period
+    # labels them, since the article list below is the latest 20 however old they are
+    since = int(time.time()) - DASHBOARD_STATS_HOURS * 3600 if DASHBOARD_STATS_HOURS > 0 else None
+    totals = query_rollups(start=since)["totals"]
+    last_updated = datetime.now(IST_ZONE).strftime('%Y-%m-%d %H:%M') if IST_ZONE else datetime.utcnow().strftime('%Y-%m-%d %H:%M')
+    return {"total_articles": totals["articles"], "positive_news": totals["positive"],
+            "negative_news": totals["negative"], "avg_confidence": int(totals["avg_confidence"]),
+            "last_updated": last_updated,
+            "stats_period": "last %dh" % DASHBOARD_STATS_HOURS if DASHBOARD_STATS_HOURS > 0 else "all time"}
+
 @app.route("/")
+@cached_response(period=60)
 def index():
-    articles = get_articles_from_db(limit=20)
+    articles = get_articles_from_db(limit=20, dedupe=DASHBOARD_DEDUPE)
+    fetching = False
     if not articles:
-        fetch_all_news()
-        articles = get_articles_from_db(limit=20)
-    total_articles = len(articles)
-    positive_news = len([a for a in articles if a['sentiment'] == 'Positive'])
-    negative_news = len([a for a in articles if a['sentiment'] == 'Negative'])
-    avg_confidence = int(sum(a['confidence'] for a in articles) / max(1, total_articles))
-    last_updated = datetime.now(IST_ZONE).strftime('%Y-%m-%d %H:%M') if IST_ZONE else datetime.utcnow().strftime('%Y-%m-%d %H:%M')
-    return render_template_string(HTML_TEMPLATE,
-                                  articles=articles,
-                                  total_articles=total_articles,
-                                  positive_news=positive_news,
-                                  negative_news=negative_news,
-                                  avg_confidence=avg_confidence,
-                                  last_updated=last_updated)
+        # Never block the page on an ingest run; show what exists and let the job fill in
+        submit_fetch_job("dashboard")
+        fetching = True
+    resp = app.make_response(render_template_string(HTML_TEMPLATE,
+                                                    articles=articles,
+                                                    fetching=fetching,
+                                                    last_id=get_max_article_id(),
+                                                    **dashboard_counters()))
+    if fetching:
+        resp.headers["Cache-Control"] = "no-store"
+    return resp
 
 @app.route("/api/news")
+@cached_response
 def api_news():
     region = request.args.get("region")
     category = request.args.get("category")
     limit = int(request.args.get("limit", 50))
-    articles = get_articles_from_db(limit=limit, region=region, category=category)
-    return jsonify(articles)
+    before = request.args.get("before")
+    try:
+        articles = get_articles_from_db(limit=limit, region=region, category=category, before=before,
+                                        dedupe=request.args.get("dedupe", "").lower() in ("1", "true", "yes"))
+    except ValueError:
+        return jsonify({"error": "invalid cursor", "status": "failed"}), 400
+    resp = jsonify(articles)
+    if articles and len(articles) == limit:
+        # The body stays a plain list; the cursor for the next page travels in headers
+        next_cursor = make_cursor(articles[-1])
+        args = request.args.to_dict()
+        args["before"] = next_cursor
+        resp.headers["X-Next-Cursor"] = next_cursor
+        resp.headers["Link"] = '<%s>; rel="next"' % url_for("api_news", **args)
+    return resp
+
+@app.route("/api/symbols/<symbol>/news")
+@cached_response
+def api_symbol_news(symbol):
+    try:
+        limit = max(1, min(int(request.args.get("limit", 50)), 500))
+    except ValueError as e:
+        return jsonify({"error": str(e), "status": "failed"}), 400
+    try:
+        articles = get_symbol_articles(symbol, limit=limit, before=request.args.get("before"),
+                                       dedupe=request.args.get("dedupe", "").lower() in ("1", "true", "yes"))
+    except ValueError:
+        return jsonify({"error": "invalid cursor", "status": "failed"}), 400
+    resp = jsonify(articles)
+    if articles and len(articles) == limit:
+        next_cursor = make_cursor(articles[-1])
+        args = request.args.to_dict()
+        args["before"] = next_cursor
+        resp.headers["X-Next-Cursor"] = next_cursor
+        resp.headers["Link"] = '<%s>; rel="next"' % url_for("api_symbol_news", symbol=symbol, **args)
+    return resp
+
+def parse_time_arg(value):
+    # Epoch seconds or an ISO-8601 date/datetime (naive values are UTC)
+    if value is None or value == "":
+        return None
+    if value.lstrip("-").isdigit():
+        return int(value)
+    epoch = timestamp_to_epoch(value)
+    if epoch is None:
+        raise ValueError("invalid time: %s" % value)
+    return epoch
+
+@app.route("/api/stats")
+@cached_response
+def api_stats():
+    try:
+        stats = query_rollups(start=parse_time_arg(request.args.get("start")),
+                              end=parse_time_arg(request.args.get("end")),
+                              region=request.args.get("region"),
+                              category=request.args.get("category"),
+                              source=request.args.get("source"),
+                              group_by=request.args.get("group_by"))
+    except ValueError as e:
+        return jsonify({"error": str(e), "status": "failed"}), 400
+    return jsonify(stats)
+
+@app.route("/api/sentiment/timeseries")
+@cached_response(period=lambda: None if request.args.get("end") else 60)
+def api_sentiment_timeseries():
+    if np is None:
+        return jsonify({"error": "numpy is not installed", "status": "failed"}), 503
+    try:
+        end = parse_time_arg(request.args.get("end")) or int(time.time())
+        start = parse_time_arg(request.args.get("start"))
+        start = end - 7 * 86400 if start is None else start
+        bucket = max(60, parse_duration(request.args.get("bucket"), 3600))
+        max_points = min(int(request.args.get("max_points", 500)), TIMESERIES_MAX_POINTS)
+        window = int(request.args.get("window", 6))
+    except ValueError as e:
+        return jsonify({"error": str(e), "status": "failed"}), 400
+    if start >= end or max_points < 1 or window < 1:
+        return jsonify({"error": "need start < end, max_points >= 1 and window >= 1", "status": "failed"}), 400
+    series = sentiment_timeseries(start, end, bucket=bucket, max_points=max_points, window=window,
+                                  region=request.args.get("region"), category=request.args.get("category"),
+                                  source=request.args.get("source"), symbol=request.args.get("symbol"))
+    return jsonify(series)
+
+@app.route("/api/search")
+@cached_response
+def api_search():
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"error": "missing q", "status": "failed"}), 400
+    try:
+        limit = max(1, min(int(request.args.get("limit", 20)), 100))
+        offset = max(0, int(request.args.get("offset", 0)))
+    except ValueError as e:
+        return jsonify({"error": str(e), "status": "failed"}), 400
+    try:
+        results = search_articles(query, limit=limit, offset=offset,
+                                  region=request.args.get("region"), category=request.args.get("category"))
+    except RuntimeError as e:
+        return jsonify({"error": str(e), "status": "failed"}), 501
+    except sqlite3.OperationalError as e:
+        return jsonify({"error": "invalid query: %s" % e, "status": "failed"}), 400
+    return jsonify({"query": query, "results": results,
+                    "next_offset": offset + limit if len(results) == limit else None})
+
+@app.route("/api/news/export")
+def api_news_export():
+    fmt = request.args.get("format", "ndjson")
+    fields = [f for f in request.args.get("fields", "").split(",") if f] or list(ARTICLE_COLUMNS)
+    compress = request.args.get("gzip", "").lower() in ("1", "true", "yes")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be one of %s" % ", ".join(EXPORT_FORMATS), "status": "failed"}), 400
+    unknown = [f for f in fields if f not in ARTICLE_COLUMNS]
+    if unknown:
+        return jsonify({"error": "unknown fields: %s" % ", ".join(unknown), "status": "failed"}), 400
+    try:
+        start = parse_time_arg(request.args.get("start"))
+        end = parse_time_arg(request.args.get("end"))
+    except ValueError as e:
+        return jsonify({"error": str(e), "status": "failed"}), 400
+    body = iter_export(fields, fmt, start=start, end=end, region=request.args.get("region"),
+                       category=request.args.get("category"), compress=compress)
+    # gzip=1 downloads a .gz file; it is not a transfer encoding, so clients keep it compressed
+    filename = "news_export.%s%s" % (fmt, ".gz" if compress else "")
+    resp = app.response_class(body, mimetype="application/gzip" if compress else EXPORT_FORMATS[fmt])
+    resp.headers["Content-Disposition"] = 'attachment; filename="%s"' % filename
+    return resp
+
+@app.route("/api/archive")
+@cached_response
+def api_archive():
+    try:
+        start = parse_time_arg(request.args.get("start"))
+        end = parse_time_arg(request.args.get("end"))
+        limit = max(1, min(int(request.args.get("limit", 100)), 1000))
+    except ValueError as e:
+        return jsonify({"error": str(e), "status": "failed"}), 400
+    articles = query_archive(start=start, end=end, region=request.args.get("region"),
+                             category=request.args.get("category"), source=request.args.get("source"), limit=limit)
+    return jsonify({"count": len(articles), "articles": articles})
+
+_STREAMS = {"active": 0}
+_STREAMS_LOCK = threading.Lock()
+
+STREAM_ARTICLE_FIELDS = ("id", "title", "summary", "source", "region", "category", "sentiment", "confidence",
+                         "market_impact", "impact_score", "timestamp")
+
+def _sse(event, data, event_id=None):
+    lines = ["event: %s" % event]
+    if event_id is not None:
+        lines.append("id: %s" % event_id)
+    lines.append("data: %s" % json.dumps(data, ensure_ascii=False))
+    return "\n".join(lines) + "\n\n"
+
+@app.route("/api/dashboard")
+@cached_response(period=60)
+def api_dashboard():
+    # What the dashboard polls when it cannot hold a stream open: the same list and
+    # counters the page renders
+    articles = get_articles_from_db(limit=20, dedupe=DASHBOARD_DEDUPE)
+    return jsonify({"last_id": get_max_article_id(), "counters": dashboard_counters(),
+                    "articles": [{f: a[f] for f in STREAM_ARTICLE_FIELDS} for a in articles]})
+
+@app.route("/stream")
+def stream():
+    # Server-Sent Events: an "articles" event with the rows inserted since the client's
+    # last event id and a "counters" event whenever the data generation changes.
+    # Between ingests an open dashboard only costs a keepalive comment every
+    # STREAM_KEEPALIVE_SECONDS. Each stream holds a worker thread, so there are at
+    # most STREAM_MAX_CLIENTS per process; streams end after STREAM_MAX_SECONDS and
+    # the browser reconnects with Last-Event-ID.
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("since")
+    try:
+        last_id = int(last_id) if last_id else get_max_article_id()
+    except ValueError:
+        return jsonify({"error": "invalid event id"}), 400
+    with _STREAMS_LOCK:
+        if _STREAMS["active"] >= STREAM_MAX_CLIENTS:
+            METRICS.inc("newsapp_stream_rejected_total")
+            resp = jsonify({"error": "too many live streams, try again later"})
+            resp.status_code = 503
+            resp.headers["Retry-After"] = "30"
+            return resp
+        _STREAMS["active"] += 1
+    dedupe = DASHBOARD_DEDUPE
+
+    def release():
+        with _STREAMS_LOCK:
+            _STREAMS["active"] -= 1
+
+    def events(last_id):
+        METRICS.inc("newsapp_stream_connections_total")
+        yield "retry: 5000\n\n"
+        seen = ARTICLE_EVENTS.version
+        generation = get_generation()
+        started = last_sent = time.monotonic()
+        if get_max_article_id() > last_id:
+            generation = None
+        while time.monotonic() - started < STREAM_MAX_SECONDS:
+            if generation is not None:
+                seen = ARTICLE_EVENTS.wait(seen, STREAM_POLL_SECONDS)
+            current = get_generation()
+            if current != generation:
+                generation = current
+                max_id = get_max_article_id()
+                if max_id > last_id:
+                    articles = [a for a in get_articles_after(last_id, limit=20, dedupe=dedupe) if a["id"] <= max_id]
+                    last_id = max_id
+                    yield _sse("articles", {"last_id": last_id, "articles": [
+                        {f: a[f] for f in STREAM_ARTICLE_FIELDS} for a in articles]}, event_id=last_id)
+                yield _sse("counters", dashboard_counters())
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= STREAM_KEEPALIVE_SECONDS:
+                yield ": keepalive\n\n"
+                last_sent = time.monotonic()
+
+    # call_on_close also runs when the client goes away before the first chunk
+    resp = app.response_class(events(last_id), mimetype="text/event-stream")
+    resp.call_on_close(release)
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+@app.route("/api/sources")
+def api_sources():
+    # Polling state per source; not cached because it changes without new articles
+    state, now = load_source_state(), time.time()
+    day = _budget_day(now)
+    result = []
+    for name, conf in NEWS_SOURCES.items():
+        st = state.get(name) or {}
+        result.append({"source": name, "interval_seconds": st.get("interval"),
+                       "next_due_in": round(st["next_due"] - now, 1) if st else 0.0,
+                       "rate_per_hour": round(st["rate"], 3) if st.get("rate") is not None else None,
+                       "error_streak": st.get("error_streak", 0), "last_status": st.get("last_status"),
+                       "requests_today": _requests_today(st, day), "daily_budget": conf.get("daily_budget")})
+    return jsonify({"market_hours": in_market_hours(now), "sources": result})
+
+@app.route("/metrics")
+def metrics():
+    return app.response_class(METRICS.render(), mimetype="text/plain; version=0.0.4")
 
 @app.route("/manual-fetch")
 def manual_fetch():
-    try:
-        arts = fetch_all_news()
-        return jsonify({"message": f"Fetched {len(arts)} articles", "status": "success"})
-    except Exception as e:
-        logging.exception("Manual fetch failed")
-        return jsonify({"error": str(e), "status": "failed"}), 500
+    job, started = submit_fetch_job("manual")
+    return jsonify({"message": "Fetch started" if started else "Joined the fetch already in progress",
+                    "job_id": job["id"], "status": job["status"],
+                    "status_url": url_for("fetch_job_status", job_id=job["id"])}), 202
+
+@app.route("/jobs/<job_id>")
+def fetch_job_status(job_id):
+    job = get_fetch_job(job_id)
+    if job is None:
+        return jsonify({"error": "unknown job", "status": "failed"}), 404
+    return jsonify(job)
 
 # ----- Scheduler -----
 def start_scheduler():
     try:
         scheduler = BackgroundScheduler(timezone=IST_ZONE if IST_ZONE else None)
-        scheduler.add_job(fetch_all_news, "cron", hour=8, minute=0, id="daily_news_fetch")
-        scheduler.add_job(fetch_all_news, "cron", hour="9-18/2", minute=0, id="market_hours_fetch")
+        if FETCH_SCHEDULE == "cron":
+            scheduler.add_job(scheduled_fetch, "cron", hour=8, minute=0, id="daily_news_fetch")
+            scheduler.add_job(scheduled_fetch, "cron", hour="9-18/2", minute=0, id="market_hours_fetch")
+        else:
+            scheduler.add_job(scheduled_tick, "interval", seconds=POLL_TICK_SECONDS, id="adaptive_poll",
+                              next_run_time=datetime.now(IST_ZONE) if IST_ZONE else datetime.now())
+        if RETENTION_DAYS > 0:
+            scheduler.add_job(run_retention, "cron", hour=2, minute=30, id="retention")
         scheduler.start()
-        atexit.register(lambda: scheduler.shutdown(wait=False))
         logging.info("Scheduler started")
+        return scheduler
     except Exception:
         logging.exception("Failed to start scheduler")
+        return None
 
-# ----- Main -----
-if __name__ == "__main__":
+class SchedulerLeadership:
+    # Keeps renewing the "scheduler" lease; the process holding it runs APScheduler
+    # (and an initial fetch when it takes over), everyone else only serves reads.
+    # In adaptive mode the first poll tick fires immediately and plays that role.
+    def __init__(self, ttl=LEASE_TTL, holder=None):
+        self.ttl = ttl
+        self.holder = holder or PROCESS_ID
+        self.scheduler = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def is_leader(self):
+        return self.scheduler is not None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="scheduler-lease", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                leader = acquire_lease("scheduler", self.holder, self.ttl)
+            except Exception:
+                logging.exception("Scheduler lease renewal failed")
+                leader = False
+            if leader and self.scheduler is None:
+                logging.info("Process %s is now the scheduler leader", self.holder)
+                self.scheduler = start_scheduler()
+                if FETCH_SCHEDULE == "cron":
+                    submit_fetch_job("leader")
+            elif not leader and self.scheduler is not None:
+                logging.warning("Process %s lost the scheduler lease", self.holder)
+                self._shutdown_scheduler()
+            self._stop.wait(self.ttl / 3)
+
+    def _shutdown_scheduler(self):
+        if self.scheduler is not None:
+            try:
+                self.scheduler.shutdown(wait=False)
+            except Exception:
+                logging.exception("Scheduler shutdown failed")
+            self.scheduler = None
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        if self.scheduler is not None:
+            self._shutdown_scheduler()
+            try:
+                release_lease("scheduler", self.holder)
+            except Exception:
+                logging.exception("Could not release the scheduler lease")
+
+_BACKGROUND = {}
+
+def start_background_services(mode=None):
+    # Called once per process: by gunicorn's post_fork hook, `python app.py` and
+    # `python app.py ingest`. mode "lease" competes for the scheduler lease, "off"
+    # never schedules (use it on web workers when a dedicated ingest process runs).
+    # The schema must already be migrated (init_db); this only opens this process's
+    # connections and starts its background threads.
+    global PROCESS_ID
+    if _BACKGROUND.get("pid") == os.getpid():
+        return _BACKGROUND.get("leadership")
+    PROCESS_ID = "%s:%d:%s" % (socket.gethostname(), os.getpid(), uuid.uuid4().hex[:6])
+    get_read_connection()
+    mode = mode or SCHEDULER_MODE
+    leadership = SchedulerLeadership().start() if mode == "lease" else None
+    threading.Thread(target=_flush_metrics_forever, name="metrics-flush", daemon=True).start()
+    atexit.register(METRICS.flush)
+    _BACKGROUND.update(pid=os.getpid(), leadership=leadership)
+    return leadership
+
+def _flush_metrics_forever():
+    while True:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        try:
+            METRICS.flush()
+        except Exception:
+            logging.exception("Metrics flush failed")
+
+def run_ingest_worker():
     init_db()
-    start_scheduler()
+    leadership = start_background_services("lease")
+    logging.info("Ingest worker %s running; waiting for the scheduler lease", leadership.holder)
     try:
-        fetch_all_news()
-    except Exception:
-        logging.exception("Initial fetch failed")
-    app.run(host=APP_HOST, port=APP_PORT, debug=DEBUG)
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        leadership.stop()
+
+# ----- Main -----
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Financial news analyzer")
+    parser.add_argument("command", nargs="?", default="serve",
+                        choices=["serve", "migrate", "ingest", "compact", "rescore"],
+                        help="serve: web app (default); migrate: upgrade the schema and run backfills; "
+                             "ingest: scheduler-only worker process; "
+                             "compact: archive old rows, vacuum and print storage numbers before/after; "
+                             "rescore: re-score rows from older scoring versions")
+    parser.add_argument("--retention-days", type=int, help="compact: override RETENTION_DAYS")
+    parser.add_argument("--workers", type=int, help="rescore: pool size (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="rescore: rows per chunk and transaction")
+    args = parser.parse_args()
+    if args.command == "migrate":
+        init_db()
+    elif args.command == "ingest":
+        run_ingest_worker()
+    elif args.command == "compact":
+        init_db()
+        print(json.dumps(compact_database(args.retention_days), indent=2))
+    elif args.command == "rescore":
+        init_db()
+        print(json.dumps(rescore_articles(workers=args.workers, chunk_size=args.chunk_size), indent=2))
+    else:
+        init_db()
+        start_background_services()
+        app.run(host=APP_HOST, port=APP_PORT, debug=DEBUG)
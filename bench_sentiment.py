@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark the compiled sentiment engine against the original analyze_sentiment"""
+
+import argparse
+import json
+import random
+import string
+import sys
+import time
+
+import app
+
+
+def legacy_analyze_sentiment(text):
+    """The analyze_sentiment implementation the engine replaced, kept verbatim as the reference"""
+    if not text:
+        return "Neutral", 0.0, 50
+    positive_words = ["gain", "rise", "up", "positive", "growth", "profit", "bullish", "buy", "strong", "good",
+                      "surge", "rally", "boom", "increase", "advance", "recovery", "outperform", "beat",
+                      "upgraded", "optimistic", "expansion", "milestone", "breakthrough", "success"]
+    negative_words = ["fall", "drop", "down", "negative", "loss", "bearish", "sell", "weak", "decline", "bad",
+                      "crash", "plunge", "slump", "recession", "crisis", "concern", "worry", "risk",
+                      "downgrade", "disappointing", "miss", "struggle", "challenge", "volatility"]
+    high_impact_words = ["rbi", "federal", "interest rate", "policy", "gdp", "inflation", "election",
+                         "war", "oil", "gold", "dollar", "rupee", "sensex", "nifty", "bankruptcy"]
+    text_lower = text.lower()
+    pos_count = sum(1 for w in positive_words if w in text_lower)
+    neg_count = sum(1 for w in negative_words if w in text_lower)
+    impact_multiplier = 1.0
+    for w in high_impact_words:
+        if w in text_lower:
+            impact_multiplier = 1.5
+            break
+    if pos_count > neg_count:
+        sentiment = "Positive"
+        score = min(0.9, (pos_count - neg_count) * 0.3 * impact_multiplier)
+    elif neg_count > pos_count:
+        sentiment = "Negative"
+        score = -min(0.9, (neg_count - pos_count) * 0.3 * impact_multiplier)
+    else:
+        sentiment = "Neutral"
+        score = 0.0
+    total = pos_count + neg_count
+    confidence = min(95, max(60, total * 15 + 50))
+    return sentiment, score, int(confidence)
+
+
+def make_corpus(n, seed=42, lexicon_rate=0.05, words_per_article=50):
+    """Headline + summary sized texts: random filler vocabulary with lexicon words sprinkled in"""
+    rnd = random.Random(seed)
+    filler = ["".join(rnd.choice(string.ascii_lowercase) for _ in range(rnd.randint(2, 10))) for _ in range(5000)]
+    lexicon = list(app.POSITIVE_WORDS + app.NEGATIVE_WORDS + app.HIGH_IMPACT_WORDS)
+    corpus = []
+    for _ in range(n):
+        words = [rnd.choice(lexicon) if rnd.random() < lexicon_rate else rnd.choice(filler)
+                 for _ in range(words_per_article)]
+        corpus.append(" ".join(words).capitalize() + ".")
+    return corpus
+
+
+def timed(label, fn, corpus):
+    started = time.perf_counter()
+    result = fn(corpus)
+    elapsed = time.perf_counter() - started
+    return result, {"engine": label, "seconds": round(elapsed, 4),
+                    "articles_per_sec": round(len(corpus) / elapsed) if elapsed else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.articles, seed=args.seed)
+    compat = app.SentimentEngine(mode="compat")
+    word = app.SentimentEngine(mode="word")
+
+    legacy, legacy_row = timed("legacy", lambda c: [legacy_analyze_sentiment(t) for t in c], corpus)
+    _, single_row = timed("compat", lambda c: [compat.analyze(t) for t in c], corpus)
+    batch, batch_row = timed("compat_batch", compat.analyze_batch, corpus)
+    _, word_row = timed("word_batch", word.analyze_batch, corpus)
+
+    mismatches = sum(1 for old, new in zip(legacy, zip(*batch)) if old != new)
+    report = {
+        "articles": len(corpus),
+        "automaton": app.ahocorasick is not None,
+        "compat_mismatches": mismatches,
+        "results": [legacy_row, single_row, batch_row, word_row],
+    }
+    print(json.dumps(report, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
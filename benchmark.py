@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""Reproducible performance benchmark for the ingest path, the DB layer and the Flask routes.
+
+A local stand-in server serves synthetic RSS feeds and a MarketAux-shaped JSON API, so
+fetch_all_news runs end to end without touching the network. Results are printed (or
+written with --output) as JSON so runs from different commits can be diffed.
+
+    python benchmark.py --rows 10000,100000 --output bench.json
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+import app
+from bench_sentiment import make_corpus
+
+
+class StandInServer:
+    """Serves /rss/<name> and /marketaux with configurable size and latency.
+
+    The payloads are deterministic for a given revision; rotate() publishes new ones.
+    Responses carry an ETag and honour If-None-Match like a well-behaved origin.
+    """
+
+    def __init__(self, feed_items=20, api_items=20, latency=0.0, seed=7):
+        self.feed_items = feed_items
+        self.api_items = api_items
+        self.latency = latency
+        self.seed = seed
+        self.revision = 0
+        self.requests = 0
+        self._httpd = None
+
+    def rotate(self):
+        self.revision += 1
+
+    def _texts(self, name, count):
+        seed = int(hashlib.sha256(("%s:%s:%s" % (self.seed, name, self.revision)).encode()).hexdigest()[:8], 16)
+        return make_corpus(count * 2, seed=seed, lexicon_rate=0.08, words_per_article=24)
+
+    def rss(self, name):
+        texts = self._texts(name, self.feed_items)
+        now = format_datetime(datetime.now(timezone.utc))
+        items = "".join(
+            "<item><title>%s</title><link>https://example.com/%s/%d/%d</link><description>%s</description>"
+            "<pubDate>%s</pubDate></item>" % (escape(texts[2 * i][:90]), name, self.revision, i,
+                                              escape(texts[2 * i + 1]), now)
+            for i in range(self.feed_items))
+        return ("<?xml version=\"1.0\"?><rss version=\"2.0\"><channel><title>%s</title>%s</channel></rss>"
+                % (name, items)).encode("utf-8")
+
+    def api(self):
+        texts = self._texts("marketaux", self.api_items)
+        data = [{"title": texts[2 * i][:90], "description": texts[2 * i + 1], "source": "standin.example",
+                 "url": "https://example.com/api/%d/%d" % (self.revision, i)} for i in range(self.api_items)]
+        return json.dumps({"data": data}).encode("utf-8")
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                server.requests += 1
+                url = urlparse(self.path)
+                latency = float(parse_qs(url.query).get("latency", [server.latency])[0])
+                if latency:
+                    time.sleep(latency)
+                if url.path.startswith("/rss/"):
+                    body, ctype = server.rss(url.path[len("/rss/"):]), "application/rss+xml"
+                elif url.path == "/marketaux":
+                    body, ctype = server.api(), "application/json"
+                else:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return "http://127.0.0.1:%d" % self._httpd.server_address[1]
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+
+
+# (title, summary) pairs as two outlets carry them; True when they are the same story
+DEDUPE_PAIRS = [
+    # same wire story, rephrased headline, near-identical summary
+    (("Reliance Industries Q2 profit rises 12% to Rs 19,323 crore",
+      "Reliance Industries on Friday reported a 12% rise in consolidated net profit for the September quarter, "
+      "helped by stronger retail and telecom earnings, while refining margins stayed under pressure."),
+     ("RIL posts 12% jump in September-quarter net profit on retail, Jio strength",
+      "Reliance Industries reported a 12% rise in consolidated net profit for the September quarter on Friday, "
+      "helped by stronger retail and telecom earnings, though refining margins stayed under pressure."), True),
+    # headline truncated by one outlet
+    (("RBI keeps repo rate unchanged at 6.5% for ninth straight meeting, retains stance",
+      "The Reserve Bank of India held its key lending rate steady, as expected, citing sticky food inflation."),
+     ("RBI keeps repo rate unchanged at 6.5% for ninth straight meeting",
+      "The central bank left the repo rate at 6.5% and kept its policy stance unchanged as food prices stay high."), True),
+    # same headline, each outlet wrote its own summary
+    (("Sensex, Nifty end at record highs as IT stocks rally",
+      "Benchmark indices closed at fresh peaks on Monday led by gains in Infosys and TCS after strong US tech earnings."),
+     ("Sensex, Nifty end at record highs as IT stocks rally",
+      "Equity markets extended their winning streak for a fourth session, with information technology shares "
+      "outperforming on hopes of a pickup in deal wins."), True),
+    # source suffix and casing differ
+    (("Adani Ports to acquire Gopalpur Port in Rs 3,080 crore deal - Reuters",
+      "Adani Ports and Special Economic Zone said it would buy a 95% stake in Gopalpur Port from SP Group."),
+     ("ADANI PORTS TO ACQUIRE GOPALPUR PORT IN RS 3,080 CRORE DEAL",
+      "Adani Ports and Special Economic Zone will buy a 95% stake in Gopalpur Port from Shapoorji Pallonji Group."), True),
+    # MarketAux copy with a longer headline
+    (("HDFC Bank shares fall 3% after Q3 deposit growth misses estimates",
+      "Shares of HDFC Bank fell as much as 3% on Thursday after the lender's quarterly deposit growth "
+      "lagged loan growth, raising concerns over its funding costs."),
+     ("HDFC Bank shares fall 3% after Q3 deposit growth misses estimates; analysts flag margin pressure",
+      "HDFC Bank shares dropped up to 3% on Thursday as deposit growth for the quarter trailed loan growth, "
+      "fuelling worries about funding costs."), True),
+    # headline reworded around the same facts, summaries overlap partly
+    (("Infosys raises FY25 revenue growth guidance to 3.75-4.5%",
+      "Infosys lifted its annual revenue forecast after a stronger-than-expected second quarter, "
+      "as clients increased spending on digital projects."),
+     ("Infosys lifts FY25 revenue growth forecast to 3.75%-4.5% after strong Q2",
+      "Infosys raised its annual revenue growth forecast after a stronger-than-expected second quarter "
+      "as clients spent more on digital services."), True),
+    (("Gold prices hit record high as Fed rate cut bets rise",
+      "Gold climbed to an all-time peak on Tuesday as weak US data strengthened expectations of a Federal Reserve rate cut."),
+     ("Gold hits record high on growing Fed rate cut bets",
+      "Gold prices rose to a record on Tuesday after soft US economic data boosted bets on a Federal Reserve rate cut."), True),
+    (("Tata Motors to demerge commercial vehicle business into separate listed company",
+      "Tata Motors' board approved splitting the company into two listed entities, one housing commercial vehicles."),
+     ("Tata Motors board approves demerger of commercial vehicles business",
+      "The board of Tata Motors approved a plan to split the company into two listed entities, separating commercial vehicles."), True),
+    (("Rupee falls 12 paise to 83.52 against US dollar in early trade",
+      "The rupee depreciated 12 paise to 83.52 against the US dollar in early trade on Wednesday, "
+      "weighed down by a strong dollar overseas and foreign fund outflows."),
+     ("Rupee slips 12 paise to 83.52 vs dollar",
+      "The rupee depreciated 12 paise to 83.52 against the US dollar in early trade on Wednesday "
+      "due to a strong dollar overseas and foreign fund outflows."), True),
+    (("Zomato shares surge 8% after Q1 profit beats estimates",
+      "Zomato stock jumped 8% on Friday after the food delivery firm posted a higher-than-expected quarterly profit."),
+     ("Zomato stock jumps 8% as quarterly profit beats Street estimates",
+      "Shares of Zomato rose as much as 8% on Friday after the food delivery company's June-quarter profit "
+      "came in ahead of analyst estimates."), True),
+
+    # same topic, different stories
+    (("Sensex jumps 500 points, Nifty ends above 24,000",
+      "Indian shares rose on Monday led by banks and metals as foreign investors returned to local equities."),
+     ("Sensex falls 300 points, Nifty ends below 24,000",
+      "Indian shares fell on Tuesday dragged by IT and auto stocks as foreign investors sold local equities."), False),
+    (("RBI keeps repo rate unchanged at 6.5%",
+      "The Reserve Bank of India held its key lending rate steady for a ninth straight meeting."),
+     ("RBI cuts repo rate by 25 basis points to 6.25%",
+      "The Reserve Bank of India lowered its key lending rate for the first time in nearly five years."), False),
+    (("Reliance Industries Q2 profit rises 12%",
+      "Reliance Industries reported higher quarterly profit helped by retail and telecom."),
+     ("Reliance Industries Q1 profit falls 5%",
+      "Reliance Industries reported lower quarterly profit as refining margins weakened."), False),
+    (("Gold prices hit record high as Fed rate cut bets rise",
+      "Gold climbed to an all-time peak on Tuesday on rate cut expectations."),
+     ("Silver prices hit 12-year high as industrial demand rises",
+      "Silver climbed to its highest since 2012 on Tuesday on strong solar panel demand."), False),
+    (("HDFC Bank shares fall 3% after Q3 update",
+      "Shares of HDFC Bank fell after the lender's quarterly business update."),
+     ("ICICI Bank shares rise 3% after Q3 update",
+      "Shares of ICICI Bank rose after the lender's quarterly business update."), False),
+    (("Infosys raises FY25 revenue growth guidance",
+      "Infosys lifted its annual revenue forecast after a stronger second quarter."),
+     ("Wipro cuts FY25 revenue growth guidance",
+      "Wipro lowered its annual revenue forecast after a weaker second quarter."), False),
+    (("Stock market today: Sensex, Nifty open higher",
+      "Benchmark indices opened higher on Monday tracking gains in Asian markets."),
+     ("Stock market today: Sensex, Nifty open lower",
+      "Benchmark indices opened lower on Tuesday tracking losses in Asian markets."), False),
+    (("Rupee falls 12 paise to 83.52 against US dollar",
+      "The rupee fell in early trade on Wednesday on foreign fund outflows."),
+     ("Rupee rises 8 paise to 83.40 against US dollar",
+      "The rupee rose in early trade on Thursday on foreign fund inflows."), False),
+    (("Tata Motors to demerge commercial vehicle business",
+      "Tata Motors' board approved splitting the company into two listed entities."),
+     ("Tata Steel to merge six subsidiaries with itself",
+      "Tata Steel's board approved merging six subsidiaries into the parent company."), False),
+    (("Oil prices rise on Middle East supply worries",
+      "Brent crude rose 2% on Monday as tensions in the Middle East raised supply concerns."),
+     ("Oil prices fall as demand worries outweigh Middle East tensions",
+      "Brent crude fell 1% on Tuesday as weak Chinese data raised demand concerns."), False),
+]
+
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100.0 * len(ordered))) - 1))]
+
+    return {"count": len(ordered), "mean_ms": round(1000 * sum(ordered) / len(ordered), 3),
+            "p50_ms": round(1000 * pick(50), 3), "p95_ms": round(1000 * pick(95), 3),
+            "p99_ms": round(1000 * pick(99), 3), "max_ms": round(1000 * ordered[-1], 3)}
+
+
+def sample(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def synthetic_articles(count, start_index, rnd, texts):
+    regions = ["India", "Global", "Mixed"]
+    categories = ["Market News", "Monetary Policy", "IPO", "Commodities", "Banking"]
+    sources = ["Economic Times", "Business Standard", "Reuters Business", "standin.example"]
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    articles = []
+    for i in range(start_index, start_index + count):
+        title = "%s #%d" % (texts[i % len(texts)][:80], i)
+        summary = texts[(i * 7 + 3) % len(texts)]
+        sentiment, score, confidence = app.analyze_sentiment(title + " " + summary)
+        articles.append({
+            "title": title, "summary": summary, "source": rnd.choice(sources), "category": rnd.choice(categories),
+            "region": rnd.choice(regions), "sentiment": sentiment, "sentiment_score": score,
+            "confidence": confidence, "market_impact": "Low", "impact_score": round(abs(score) * 10, 1),
+            "timestamp": (base + timedelta(seconds=i * 60)).isoformat(), "url": "https://example.com/%d" % i,
+            "content": summary,
+        })
+    return articles
+
+
+def bench_fetch(server, base_url, cycles):
+    for name, conf in app.NEWS_SOURCES.items():
+        conf["url"] = base_url + ("/marketaux" if conf.get("type") == "api" else "/rss/%s" % name)
+    changed, unchanged = [], []
+    for _ in range(cycles):
+        server.rotate()
+        started = time.perf_counter()
+        app.fetch_all_news()
+        changed.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        app.fetch_all_news()
+        unchanged.append(time.perf_counter() - started)
+    return {"sources": len(app.NEWS_SOURCES), "latency_s": server.latency,
+            "changed_feeds": percentiles(changed), "unchanged_feeds": percentiles(unchanged),
+            "last_cycle_sources": app.LAST_FETCH_STATS.get("sources", {})}
+
+
+def bench_scale(rows, batch_size, iterations, rnd, texts):
+    write_timings, inserted = [], app.get_read_connection().execute("SELECT COUNT(*) FROM news_articles").fetchone()[0]
+    started = time.perf_counter()
+    while inserted < rows:
+        batch = synthetic_articles(min(batch_size, rows - inserted), inserted, rnd, texts)
+        t0 = time.perf_counter()
+        inserted += len(app.save_articles_to_db(batch))
+        write_timings.append((time.perf_counter() - t0) / max(1, len(batch)))
+    load_seconds = time.perf_counter() - started
+
+    regions = [None, "India", "Global"]
+    categories = [None, "Banking", "IPO"]
+    first_page = sample(lambda: app.get_articles_from_db(limit=50, region=rnd.choice(regions),
+                                                         category=rnd.choice(categories)), iterations)
+    # Cursor ~90% of the way down the table, i.e. a page a client reaches by paging deep
+    deep = app.get_read_connection().execute("SELECT ts, id FROM news_articles ORDER BY ts DESC, id DESC "
+                                             "LIMIT 1 OFFSET ?", (int(inserted * 0.9),)).fetchone()
+    deep_cursor = app.make_cursor({"ts": deep[0], "id": deep[1]}) if deep else None
+    deep_page = sample(lambda: app.get_articles_from_db(limit=50, before=deep_cursor), iterations) if deep_cursor else []
+
+    client = app.app.test_client()
+    routes = {
+        "/": "/",
+        "/api/news": "/api/news?limit=50",
+        "/api/news?before": "/api/news?limit=50&before=%s" % deep_cursor,
+        "/api/stats": "/api/stats?group_by=region",
+        "/api/search": "/api/search?q=rally",
+    }
+    route_results = {}
+    for label, url in routes.items():
+        def cold():
+            app.RESPONSE_CACHE.clear()
+            client.get(url)
+        route_results[label] = {"uncached": percentiles(sample(cold, iterations)),
+                                "cached": percentiles(sample(lambda: client.get(url), iterations))}
+    t0 = time.perf_counter()
+    exported = len(client.get("/api/news/export?fields=id,title,ts,sentiment_score").data)
+    export_seconds = time.perf_counter() - t0
+
+    db_bytes = sum(os.path.getsize(app.DB_PATH + suffix) for suffix in ("", "-wal")
+                   if os.path.exists(app.DB_PATH + suffix))
+    return {
+        "rows": inserted,
+        "load": {"seconds": round(load_seconds, 3), "rows_per_sec": round(inserted / load_seconds) if load_seconds else None,
+                 "per_row": percentiles(write_timings)},
+        "get_articles_first_page": percentiles(first_page),
+        "get_articles_deep_page": percentiles(deep_page),
+        "routes": route_results,
+        "export_full": {"seconds": round(export_seconds, 3), "bytes": exported,
+                        "rows_per_sec": round(inserted / export_seconds) if export_seconds else None},
+        "db_bytes": db_bytes,
+    }
+
+
+def bench_dedupe(pairs):
+    """Saves each pair as two outlets' copies and checks which ones land in one cluster."""
+    base = datetime.now(timezone.utc)
+    articles = []
+    for n, pair in enumerate(pairs):
+        for side, (title, summary) in enumerate(pair[:2]):
+            sentiment, score, confidence = app.analyze_sentiment(title + " " + summary)
+            articles.append({
+                "title": title, "summary": summary, "source": "Outlet %d" % (2 * n + side),
+                "category": "Market News", "region": "India", "sentiment": sentiment, "sentiment_score": score,
+                "confidence": confidence, "market_impact": "Low", "impact_score": round(abs(score) * 10, 1),
+                "timestamp": (base + timedelta(minutes=n)).isoformat(), "url": "https://example.com/dedupe/%d/%d" % (n, side),
+                "content": summary,
+            })
+    started = time.perf_counter()
+    app.save_articles_to_db(articles)
+    elapsed = time.perf_counter() - started
+    conn = app.get_read_connection()
+    clusters = dict(conn.execute("SELECT url, cluster_id FROM news_articles WHERE url LIKE 'https://example.com/dedupe/%'"))
+    missed, merged = [], []
+    for n, (first, second, duplicate) in enumerate(pairs):
+        same = clusters["https://example.com/dedupe/%d/0" % n] == clusters["https://example.com/dedupe/%d/1" % n]
+        if duplicate and not same:
+            missed.append(first[0])
+        elif same and not duplicate:
+            merged.append(first[0])
+    duplicates = sum(1 for pair in pairs if pair[2])
+    return {"pairs": len(pairs), "duplicates": duplicates, "threshold": app.CLUSTER_MIN_SIMILARITY,
+            "recall": round((duplicates - len(missed)) / duplicates, 3) if duplicates else None,
+            "false_merges": len(merged), "missed": missed, "merged": merged, "save_seconds": round(elapsed, 4)}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", default="10000,100000", help="comma-separated table sizes to benchmark at")
+    parser.add_argument("--batch-size", type=int, default=10000, help="articles per save_articles_to_db call")
+    parser.add_argument("--iterations", type=int, default=200, help="samples per latency measurement")
+    parser.add_argument("--feed-items", type=int, default=20, help="items per synthetic RSS feed")
+    parser.add_argument("--api-items", type=int, default=20, help="items in the synthetic MarketAux payload")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="stand-in server latency per request")
+    parser.add_argument("--fetch-cycles", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--db", help="database path (default: a fresh temporary file)")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    workdir = tempfile.mkdtemp(prefix="newsbench-")
+    app.DB_PATH = args.db or os.path.join(workdir, "bench.db")
+    app.init_db()
+
+    dedupe = bench_dedupe(DEDUPE_PAIRS)
+
+    server = StandInServer(feed_items=args.feed_items, api_items=args.api_items,
+                           latency=args.latency_ms / 1000.0, seed=args.seed)
+    base_url = server.start()
+    try:
+        fetch = bench_fetch(server, base_url, args.fetch_cycles)
+    finally:
+        server.stop()
+
+    rnd = random.Random(args.seed)
+    texts = make_corpus(5000, seed=args.seed, lexicon_rate=0.08, words_per_article=30)
+    scales = [bench_scale(int(n), args.batch_size, args.iterations, rnd, texts)
+              for n in sorted(int(x) for x in args.rows.split(",") if x)]
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "config": vars(args),
+        "dedupe": dedupe,
+        "fetch": fetch,
+        "scales": scales,
+    }
+    app.close_db_connections()
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+# Gunicorn hooks; bind/workers/threads come from the Procfile command line.
+
+
+def on_starting(server):
+    # Schema upgrades and backfills run once, in the master before any worker forks,
+    # so they are not cut short by the worker boot timeout. A release phase running
+    # `python app.py migrate` first leaves nothing to do here.
+    import app
+    app.init_db()
+    app.close_db_connections()
+
+
+def post_fork(server, worker):
+    # Every worker opens its own DB connections and competes for the scheduler
+    # lease with the other workers and any `ingest` processes, so exactly one
+    # process runs the scheduled fetches.
+    import app
+    app.start_background_services()
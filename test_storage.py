@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Storage invariants: schema migration backfills and incremental sentiment rollups"""
+
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import app
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+SOURCES = ["Economic Times", "Business Standard", "Reuters Business"]
+REGIONS = ["India", "Global", "Mixed"]
+HEADLINES = [
+    "Sensex rallies as Infosys posts strong quarterly profit",
+    "Reliance shares slump after weak refining margins",
+    "RBI holds interest rates steady, inflation outlook improves",
+    "HDFC Bank gains on robust loan growth",
+    "Gold prices fall as dollar strengthens",
+    "IPO market sees record debut for fintech listing",
+    "Oil surges on supply concerns, markets slip",
+    "Nifty ends flat amid mixed global cues",
+]
+
+# The news_articles table as the app created it before any migrations existed
+BASELINE_SCHEMA = '''
+    CREATE TABLE news_articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        summary TEXT,
+        source TEXT,
+        category TEXT,
+        region TEXT,
+        sentiment TEXT,
+        sentiment_score REAL,
+        confidence INTEGER,
+        market_impact TEXT,
+        impact_score REAL,
+        timestamp DATETIME,
+        url TEXT,
+        content TEXT,
+        UNIQUE(title, source)
+    )
+'''
+
+
+def make_articles(count, start=0):
+    articles = []
+    for i in range(start, start + count):
+        title = "%s #%d" % (HEADLINES[i % len(HEADLINES)], i)
+        summary = HEADLINES[(i * 3 + 1) % len(HEADLINES)]
+        sentiment, score, confidence = app.analyze_sentiment(title + " " + summary)
+        moment = BASE + timedelta(minutes=37 * i)
+        articles.append({
+            "title": title, "summary": summary, "source": SOURCES[i % len(SOURCES)], "category": "Market News",
+            "region": REGIONS[i * 7 % len(REGIONS)], "sentiment": sentiment, "sentiment_score": score,
+            "confidence": confidence, "market_impact": "Low", "impact_score": round(abs(score) * 10, 1),
+            # Both stored timestamp formats: IST with offset, and naive UTC
+            "timestamp": (moment.astimezone(timezone(timedelta(hours=5, minutes=30))).strftime("%Y-%m-%d %H:%M:%S %z")
+                          if i % 2 else moment.replace(tzinfo=None).isoformat()),
+            "url": "https://example.com/%d" % i,
+            "content": summary if i % 3 else summary + " Full story text.",
+        })
+    return articles
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "DB_PATH", str(tmp_path / "news.db"))
+    monkeypatch.setattr(app, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(app, "MIGRATION_BATCH_ROWS", 40)
+    yield tmp_path / "news.db"
+    app.close_db_connections()
+
+
+def rollups(since=0):
+    return app.get_read_connection().execute('''
+        SELECT bucket, region, category, source, articles, positive, negative, neutral,
+               ROUND(score_sum, 6), confidence_sum
+        FROM sentiment_rollups WHERE articles != 0 AND bucket >= ? ORDER BY 1, 2, 3, 4
+    ''', (since,)).fetchall()
+
+
+def rollups_match_articles(since=0):
+    # since (a bucket boundary) skips the hours whose articles were archived
+    raw = app.get_read_connection().execute('''
+        SELECT (ts / ?) * ?, COALESCE(region, ''), COALESCE(category, ''), COALESCE(source, ''), COUNT(*),
+               SUM(sentiment = 'Positive'), SUM(sentiment = 'Negative'),
+               SUM(sentiment NOT IN ('Positive', 'Negative')), ROUND(TOTAL(sentiment_score), 6), TOTAL(confidence)
+        FROM news_articles WHERE ts >= ? GROUP BY 1, 2, 3, 4 ORDER BY 1, 2, 3, 4
+    ''', (app.ROLLUP_BUCKET_SECONDS, app.ROLLUP_BUCKET_SECONDS, since)).fetchall()
+    return raw == rollups(since) and len(raw) > 0
+
+
+def test_migrate_baseline_schema(db):
+    """A database with the original schema gets every derived column and table backfilled"""
+    articles = make_articles(150)
+    conn = sqlite3.connect(str(db))
+    conn.execute(BASELINE_SCHEMA)
+    conn.executemany("INSERT INTO news_articles (title, summary, source, category, region, sentiment, "
+                     "sentiment_score, confidence, market_impact, impact_score, timestamp, url, content) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                     [tuple(a[f] for f in app.ARTICLE_FIELDS) for a in articles])
+    conn.commit()
+    conn.close()
+
+    app.init_db()
+    conn = app.get_read_connection()
+    assert conn.execute("SELECT key FROM app_meta WHERE key LIKE 'backfill:%'").fetchall() == []
+    for article_id, timestamp, ts in conn.execute("SELECT id, timestamp, ts FROM news_articles"):
+        assert ts == app.timestamp_to_epoch(timestamp), article_id
+    assert conn.execute("SELECT COUNT(*) FROM news_articles WHERE content = summary").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM news_articles WHERE cluster_id IS NULL").fetchone()[0] == 0
+    assert rollups_match_articles()
+
+    assert conn.execute("SELECT COUNT(*) FROM news_fts").fetchone()[0] == len(articles)
+    app.run_maintenance("INSERT INTO news_fts (news_fts, rank) VALUES ('integrity-check', 0)")
+    hits = app.search_articles("infosys", limit=100)
+    assert hits and all("Infosys" in a["title"] + a["summary"] for a in hits)
+
+    symbols = dict(conn.execute("SELECT symbol, COUNT(*) FROM article_symbols GROUP BY symbol").fetchall())
+    expected = sum(1 for a in articles if "INFY" in app.extract_symbols(a["title"] + " " + a["summary"]))
+    assert symbols.get("INFY") == expected > 0
+
+    # Nothing left to do on the next deploy
+    app.init_db()
+    assert rollups_match_articles()
+
+
+def test_rollups_follow_ingest_rescore_and_archive(db):
+    """sentiment_rollups equals a GROUP BY over news_articles after every write path"""
+    app.init_db()
+    assert app.save_articles_to_db(make_articles(120))
+    assert rollups_match_articles()
+    # Duplicates are skipped without double counting
+    app.save_articles_to_db(make_articles(130, start=100))
+    assert rollups_match_articles()
+
+    with app.write_transaction() as cur:
+        rows = cur.execute("SELECT ts, region, category, source, sentiment, sentiment_score, confidence "
+                           "FROM news_articles WHERE id % 2 = 0").fetchall()
+        app.update_rollups(cur, rows, sign=-1)
+        cur.execute("UPDATE news_articles SET sentiment = 'Neutral', sentiment_score = 0, confidence = 1, "
+                    "category = 'Stale' WHERE id % 2 = 0")
+        rows = cur.execute("SELECT ts, region, category, source, sentiment, sentiment_score, confidence "
+                           "FROM news_articles WHERE id % 2 = 0").fetchall()
+        app.update_rollups(cur, rows)
+    assert rollups_match_articles()
+    summary = app.rescore_articles(workers=2, chunk_size=50, version=app.SCORING_VERSION + 1, progress_every=0)
+    assert summary["rescored"] == 230 and summary["changed"] >= 115
+    assert app.get_read_connection().execute(
+        "SELECT COUNT(*) FROM news_articles WHERE category = 'Stale'").fetchone()[0] == 0
+    assert rollups_match_articles()
+
+    # Archived hours keep their rollups, so /api/stats still covers them
+    before = rollups()
+    now = int((BASE + timedelta(days=35)).timestamp())
+    moved = app.archive_old_articles(retention_days=30, batch_size=40, now=now)
+    assert 0 < moved < 230
+    assert rollups() == before
+    assert rollups_match_articles(since=now - 30 * 86400)
+    assert len(app.query_archive(limit=1000)) == moved